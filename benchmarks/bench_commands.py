@@ -0,0 +1,228 @@
+"""Offline throughput/latency benchmark for the slash command callbacks.
+
+Drives the real callbacks from main.py against the in-process fakes in
+fake_discord.py, so no token or network is needed:
+
+    python benchmarks/bench_commands.py
+    python benchmarks/bench_commands.py --scenario moderation_logs --latency 0.1
+
+Each scenario runs ``--requests`` interactions at each concurrency level and
+reports throughput plus p50/p95/p99 of acknowledgement and completion time.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+from fake_discord import (  # noqa: E402
+    FakeGuild,
+    FakeInteraction,
+    FakeMember,
+    FakeRest,
+)
+
+MODERATOR_ROLES = (
+    main.configs.default.mod_required_role_id,
+    main.configs.default.create_warrant_role_id,
+    main.configs.default.ssu_required_role_id,
+)
+SEEDED_USERS = 500
+SEEDED_CASES = 20_000
+
+
+def seed_cases(count: int):
+    cases = [
+        (
+            1_000_000_000_000_000_000 + i,
+            f"Suspect{i % SEEDED_USERS}",
+            f"suspect{i % SEEDED_USERS}",
+            "Strike 1",
+            "Benchmark seed",
+            "<@1>",
+            "https://discord.com/channels/0/0/0",
+            time.time(),
+        )
+        for i in range(count)
+    ]
+    main.guild_states.default.store.add_cases_batch(cases, [], 0, 0)
+
+
+async def invoke(command, interaction, **kwargs):
+    """Run a slash command the way the tree does: checks first, then callback."""
+    for check in command.checks:
+        await check(interaction)
+    await command.callback(interaction, **kwargs)
+
+
+class Scenario:
+    """Builds one interaction and runs the callback under test for it."""
+
+    def __init__(self, rest: FakeRest, guild: FakeGuild):
+        self.rest = rest
+        self.guild = guild
+        self.sequence = 0
+
+    def member(self) -> FakeMember:
+        self.sequence += 1
+        return FakeMember(self.sequence, MODERATOR_ROLES)
+
+    async def setup(self):
+        pass
+
+    async def run_one(self) -> FakeInteraction:
+        raise NotImplementedError
+
+
+class LogModeration(Scenario):
+    async def run_one(self):
+        interaction = FakeInteraction(self.rest, self.guild, self.member())
+        await invoke(
+            main.log_moderation,
+            interaction,
+            roblox_username=f"Suspect{self.sequence % SEEDED_USERS}",
+            mod_type="Strike 1",
+            reason="Benchmark",
+        )
+        return interaction
+
+
+class ModerationLogs(Scenario):
+    async def setup(self):
+        seed_cases(SEEDED_CASES)
+
+    async def run_one(self):
+        interaction = FakeInteraction(self.rest, self.guild, self.member())
+        await invoke(
+            main.moderation_logs,
+            interaction,
+            roblox_username=f"suspect{self.sequence % SEEDED_USERS}",
+        )
+        return interaction
+
+
+class Warrant(Scenario):
+    async def run_one(self):
+        interaction = FakeInteraction(self.rest, self.guild, self.member())
+        await invoke(
+            main.warrant,
+            interaction,
+            suspect_username=f"Suspect{self.sequence % SEEDED_USERS}",
+            charges="1x evasion, 2x reckless driving",
+        )
+        return interaction
+
+
+class SSUAttend(Scenario):
+    async def setup(self):
+        self.view = main.SSUVoteView()
+        channel = self.guild.get_channel(main.configs.default.ssu_ssd_target_channel_id)
+        self.vote_message = await channel.send(embed=None)
+
+    async def run_one(self):
+        interaction = FakeInteraction(
+            self.rest, self.guild, self.member(), message=self.vote_message
+        )
+        await self.view.attend_button.callback(interaction)
+        return interaction
+
+
+SCENARIOS = {
+    "log_moderation": LogModeration,
+    "moderation_logs": ModerationLogs,
+    "warrant": Warrant,
+    "ssu_attend": SSUAttend,
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run_level(scenario: Scenario, requests: int, concurrency: int) -> str:
+    semaphore = asyncio.Semaphore(concurrency)
+    ack_times = []
+    total_times = []
+
+    async def one():
+        async with semaphore:
+            interaction = await scenario.run_one()
+            finished = time.perf_counter()
+            ack_times.append(interaction.response.acked_at - interaction.started)
+            total_times.append(finished - interaction.started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    def ms(values, q):
+        return f"{percentile(values, q) * 1000:8.1f}"
+
+    return (
+        f"{concurrency:>5} {requests / elapsed:>9.1f} "
+        f"{ms(ack_times, 0.5)} {ms(ack_times, 0.99)} "
+        f"{ms(total_times, 0.5)} {ms(total_times, 0.95)} {ms(total_times, 0.99)}"
+    )
+
+
+async def run_scenario(name: str, args: argparse.Namespace):
+    rest = FakeRest(args.latency, args.jitter, args.bucket_limit, args.bucket_window)
+    guild = FakeGuild(rest)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main.guild_states = main.GuildStates(os.path.join(tmp, "bench.db"))
+        scenario = SCENARIOS[name](rest, guild)
+        await scenario.setup()
+
+        print(f"\n{name}")
+        print(
+            "conc.     ops/s  ack p50  ack p99  p50 (ms)  p95 (ms)  p99 (ms)"
+        )
+        for concurrency in args.concurrency:
+            rest.calls = rest.rate_limited = 0
+            print(await run_level(scenario, args.requests, concurrency), end="")
+            print(
+                f"   rest/op {rest.calls / args.requests:.2f}"
+                f"  429s {rest.rate_limited}"
+            )
+        main.guild_states.close()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), action="append", dest="scenarios"
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 10, 100]
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="simulated REST latency (s)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.02, help="random extra latency (s)"
+    )
+    parser.add_argument(
+        "--bucket-limit", type=int, default=50, help="requests per route bucket"
+    )
+    parser.add_argument(
+        "--bucket-window", type=float, default=1.0, help="bucket reset window (s)"
+    )
+    args = parser.parse_args()
+
+    async def run_all():
+        for name in args.scenarios or sorted(SCENARIOS):
+            await run_scenario(name, args)
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main_cli()
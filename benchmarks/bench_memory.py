@@ -0,0 +1,274 @@
+"""Resident memory of the gateway caches under each CACHE_PROFILE.
+
+Feeds synthetic gateway payloads for one large guild through discord.py's own
+event parsers, built with each profile's client options, and reports the
+process RSS after connecting (guild create plus any startup chunking) and
+after a stretch of steady-state traffic:
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --members 200000 --profile lazy
+
+Only events the profile's intents subscribe to are delivered, as on the real
+gateway. Each profile runs in its own interpreter so the numbers do not share
+a heap.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+GUILD_ID = 1_100_000_000_000_000_000
+FIRST_MEMBER_ID = 1_200_000_000_000_000_000
+FIRST_CHANNEL_ID = 1_300_000_000_000_000_000
+ROLE_COUNT = 50
+TEXT_CHANNELS = 40
+VOICE_CHANNELS = 10
+CHUNK_SIZE = 1000
+TIMESTAMP = "2024-11-01T12:00:00+00:00"
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        # Peak rather than current RSS, but the phases only ever grow.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure() -> float:
+    gc.collect()
+    return rss_mb()
+
+
+def user_payload(member_id: int) -> dict:
+    return {
+        "id": str(member_id),
+        "username": f"member{member_id % 10**7}",
+        "global_name": f"Member {member_id % 10**7}",
+        "discriminator": "0",
+        "avatar": None,
+    }
+
+
+def member_payload(member_id: int, with_user: bool = True) -> dict:
+    member = {
+        "roles": [
+            str(GUILD_ID + 1 + role)
+            for role in random.sample(range(ROLE_COUNT), 3)
+        ],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "nick": None,
+        "flags": 0,
+    }
+    if with_user:
+        member["user"] = user_payload(member_id)
+    return member
+
+
+def guild_payload(members: int) -> dict:
+    role = {
+        "permissions": "0",
+        "color": 0,
+        "hoist": False,
+        "managed": False,
+        "mentionable": False,
+    }
+    return {
+        "id": str(GUILD_ID),
+        "name": "Benchmark guild",
+        "member_count": members,
+        "large": True,
+        "unavailable": False,
+        "roles": [
+            {**role, "id": str(GUILD_ID + i), "name": f"role-{i}", "position": i}
+            for i in range(ROLE_COUNT + 1)
+        ],
+        "channels": [
+            {
+                "id": str(FIRST_CHANNEL_ID + i),
+                "type": 2 if i >= TEXT_CHANNELS else 0,
+                "name": f"channel-{i}",
+                "position": i,
+                "permission_overwrites": [],
+                "bitrate": 64000,
+                "user_limit": 0,
+            }
+            for i in range(TEXT_CHANNELS + VOICE_CHANNELS)
+        ],
+        "members": [],
+        "voice_states": [],
+        "presences": [],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+    }
+
+
+def chunk_guild(state, members: int):
+    """Deliver a full GUILD_MEMBERS_CHUNK sequence for a caching chunk request."""
+    from discord.state import ChunkRequest
+
+    request = ChunkRequest(
+        GUILD_ID, 0, asyncio.get_running_loop(), state._get_guild, cache=True
+    )
+    state._chunk_requests[request.nonce] = request
+    count = (members + CHUNK_SIZE - 1) // CHUNK_SIZE
+    for index in range(count):
+        start = FIRST_MEMBER_ID + index * CHUNK_SIZE
+        stop = min(FIRST_MEMBER_ID + members, start + CHUNK_SIZE)
+        state.parse_guild_members_chunk(
+            {
+                "guild_id": str(GUILD_ID),
+                "members": [member_payload(i) for i in range(start, stop)],
+                "chunk_index": index,
+                "chunk_count": count,
+                "nonce": request.nonce,
+            }
+        )
+
+
+def steady_traffic(state, intents, members: int, events: int):
+    """Messages, member updates and voice joins from random members."""
+    message_ids = iter(range(FIRST_CHANNEL_ID * 2, FIRST_CHANNEL_ID * 3))
+    for _ in range(events):
+        member_id = FIRST_MEMBER_ID + random.randrange(members)
+        if intents.guild_messages:
+            state.parse_message_create(
+                {
+                    "id": str(next(message_ids)),
+                    "channel_id": str(
+                        FIRST_CHANNEL_ID + random.randrange(TEXT_CHANNELS)
+                    ),
+                    "guild_id": str(GUILD_ID),
+                    "author": user_payload(member_id),
+                    "member": member_payload(member_id, with_user=False),
+                    "content": "x" * random.randrange(20, 200),
+                    "timestamp": TIMESTAMP,
+                    "edited_timestamp": None,
+                    "tts": False,
+                    "mention_everyone": False,
+                    "mentions": [],
+                    "mention_roles": [],
+                    "attachments": [],
+                    "embeds": [],
+                    "pinned": False,
+                    "type": 0,
+                }
+            )
+        if intents.members and random.random() < 0.1:
+            state.parse_guild_member_update(
+                {"guild_id": str(GUILD_ID), **member_payload(member_id)}
+            )
+        if intents.voice_states and random.random() < 0.05:
+            state.parse_voice_state_update(
+                {
+                    "guild_id": str(GUILD_ID),
+                    "channel_id": str(
+                        FIRST_CHANNEL_ID + TEXT_CHANNELS + random.randrange(
+                            VOICE_CHANNELS
+                        )
+                    ),
+                    "user_id": str(member_id),
+                    "member": member_payload(member_id),
+                    "session_id": "benchmark",
+                    "deaf": False,
+                    "mute": False,
+                    "self_deaf": False,
+                    "self_mute": False,
+                    "self_video": False,
+                    "suppress": False,
+                    "request_to_speak_timestamp": None,
+                }
+            )
+
+
+async def profile_run(name: str, members: int, events: int) -> dict:
+    import discord
+
+    import main
+
+    random.seed(0)
+    profile = main.CACHE_PROFILES[name]
+    result = {"profile": name, "baseline": measure()}
+
+    client = discord.Client(**profile.client_options())
+    state = client._connection
+    state.user = discord.ClientUser(
+        state=state, data={**user_payload(GUILD_ID - 1), "bot": True}
+    )
+    state._add_guild_from_data(guild_payload(members))
+    if profile.chunk_at_startup:
+        chunk_guild(state, members)
+    result["startup"] = measure()
+
+    steady_traffic(state, profile.intents(), members, events)
+    result["steady"] = measure()
+
+    guild = client.get_guild(GUILD_ID)
+    result["members"] = len(guild.members)
+    result["messages"] = len(client.cached_messages)
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile", choices=["full", "lazy", "minimal"], action="append",
+        dest="profiles",
+    )
+    parser.add_argument("--members", type=int, default=50_000)
+    parser.add_argument(
+        "--events", type=int, default=20_000, help="steady-state gateway events"
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(profile_run(args.child, args.members, args.events))
+        print(json.dumps(result))
+        return
+
+    print(f"{args.members} members, {args.events} events; RSS in MB")
+    print("profile    baseline  startup   steady  members  messages")
+    for name in args.profiles or ["full", "lazy", "minimal"]:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                name,
+                "--members",
+                str(args.members),
+                "--events",
+                str(args.events),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{name:<9} {result['baseline']:>9.1f} {result['startup']:>8.1f} "
+            f"{result['steady']:>8.1f} "
+            f"{result['members']:>8} {result['messages']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
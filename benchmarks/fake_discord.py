@@ -0,0 +1,251 @@
+"""In-process stand-ins for the Discord objects the command callbacks touch.
+
+Every REST-shaped call sleeps for a simulated latency and goes through a
+per-route token bucket, so rate limiting shows up the same way it would
+against the real API (as a wait plus a counted 429 retry).
+"""
+
+import asyncio
+import dataclasses
+import itertools
+import random
+import time
+
+import discord
+
+import main
+
+# Discord snowflakes for late 2024; anything in this range passes for a real ID.
+_snowflakes = itertools.count(1_300_000_000_000_000_000)
+
+
+def next_snowflake() -> int:
+    return next(_snowflakes)
+
+
+class FakeRest:
+    """Simulated REST latency plus per-route rate-limit buckets."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        bucket_limit: int = 50,
+        bucket_window: float = 1.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.buckets: dict[str, tuple[float, int]] = {}
+        self.calls = 0
+        self.rate_limited = 0
+
+    async def call(self, route: str, counted: bool = True):
+        """Wait for the route's bucket, then for the simulated round trip.
+
+        ``counted`` mirrors the real bot: interaction responses and followups
+        go through the interaction webhook and are not counted as bot REST
+        calls.
+        """
+        while True:
+            now = time.perf_counter()
+            reset_at, used = self.buckets.get(route, (now + self.bucket_window, 0))
+            if now >= reset_at:
+                reset_at, used = now + self.bucket_window, 0
+            if used < self.bucket_limit:
+                self.buckets[route] = (reset_at, used + 1)
+                break
+            self.rate_limited += 1
+            if counted:
+                main.metrics.record_rate_limit()
+            await asyncio.sleep(reset_at - now)
+
+        if counted:
+            self.calls += 1
+            main.metrics.record_rest_call()
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(0, self.jitter)))
+
+
+class FakeMember(discord.Member):
+    """A ``discord.Member`` that passes isinstance checks without a gateway."""
+
+    def __init__(self, user_id: int, role_ids=(), administrator: bool = False):
+        self.fake_id = user_id
+        self.fake_roles = [discord.Object(id=role_id) for role_id in role_ids]
+        self.fake_permissions = discord.Permissions(administrator=administrator)
+
+    id = property(lambda self: self.fake_id)
+    roles = property(lambda self: self.fake_roles)
+    guild_permissions = property(lambda self: self.fake_permissions)
+    bot = property(lambda self: False)
+    mention = property(lambda self: f"<@{self.fake_id}>")
+    display_name = property(lambda self: f"member-{self.fake_id}")
+
+    def __repr__(self):
+        return f"<FakeMember id={self.fake_id}>"
+
+
+class FakeMessage:
+    def __init__(self, rest: FakeRest, channel: "FakeChannel", **kwargs):
+        self.rest = rest
+        self.channel = channel
+        self.id = next_snowflake()
+        self.content = kwargs.get("content")
+        embed = kwargs.get("embed")
+        self.embeds = [embed] if embed is not None else []
+        self.reactions = []
+        self.created_at = discord.utils.utcnow()
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/0/{self.channel.id}/{self.id}"
+
+    async def edit(self, **kwargs):
+        await self.rest.call(f"PATCH /channels/{self.channel.id}/messages")
+        if "embed" in kwargs:
+            self.embeds = [kwargs["embed"]] if kwargs["embed"] is not None else []
+        return self
+
+    async def delete(self):
+        await self.rest.call(f"DELETE /channels/{self.channel.id}/messages")
+        self.channel.messages.pop(self.id, None)
+
+
+class FakeChannel:
+    def __init__(self, rest: FakeRest, channel_id: int):
+        self.rest = rest
+        self.id = channel_id
+        self.messages: dict[int, FakeMessage] = {}
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    async def send(self, **kwargs) -> FakeMessage:
+        await self.rest.call(f"POST /channels/{self.id}/messages")
+        message = FakeMessage(self.rest, self, **kwargs)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.rest.call(f"GET /channels/{self.id}/messages")
+        try:
+            return self.messages[message_id]
+        except KeyError:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message") from None
+
+    async def history(self, *, limit=100, after=None, before=None, oldest_first=None):
+        messages = sorted(self.messages.values(), key=lambda m: m.id)
+        if after is not None:
+            messages = [m for m in messages if m.id > after.id]
+        if not oldest_first:
+            messages.reverse()
+        if limit is not None:
+            messages = messages[:limit]
+        for start in range(0, len(messages), 100):
+            await self.rest.call(f"GET /channels/{self.id}/messages")
+            for message in messages[start : start + 100]:
+                yield message
+
+
+class FakeGuild:
+    """A guild holding only the channels it is created with.
+
+    By default those are every channel in its config (see ``main.config_for``),
+    so it is served like the guild the config belongs to.
+    """
+
+    def __init__(self, rest: FakeRest, guild_id: int = 1, channel_ids=None):
+        self.rest = rest
+        self.id = guild_id
+        if channel_ids is None:
+            config = main.config_for(guild_id)
+            channel_ids = [
+                value
+                for field in dataclasses.fields(config)
+                if field.name.endswith("_channel_id")
+                and (value := getattr(config, field.name))
+            ]
+        self.channels = {
+            channel_id: FakeChannel(rest, channel_id) for channel_id in channel_ids
+        }
+        self.members: dict[int, FakeMember] = {}
+
+    def get_channel(self, channel_id: int) -> FakeChannel | None:
+        return self.channels.get(channel_id)
+
+    def get_member(self, user_id: int) -> FakeMember | None:
+        return self.members.get(user_id)
+
+
+class _FakeResponse:
+    """Just enough of an aiohttp response for ``discord.HTTPException``."""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.done = False
+        self.acked_at: float | None = None
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def _ack(self):
+        if self.done:
+            raise discord.InteractionResponded(self.interaction)
+        await self.interaction.rest.call(
+            f"POST /interactions/{self.interaction.id}/callback", counted=False
+        )
+        self.done = True
+        self.acked_at = time.perf_counter()
+
+    async def defer(self, **kwargs):
+        await self._ack()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._ack()
+        self.interaction.replies.append(content)
+
+    async def edit_message(self, **kwargs):
+        await self._ack()
+        self.interaction.replies.append(kwargs.get("content"))
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        await self.interaction.rest.call(
+            f"POST /webhooks/{self.interaction.id}", counted=False
+        )
+        self.interaction.replies.append(content)
+
+
+class FakeInteraction:
+    def __init__(
+        self,
+        rest: FakeRest,
+        guild: FakeGuild,
+        user: FakeMember,
+        channel: FakeChannel | None = None,
+        message: FakeMessage | None = None,
+    ):
+        self.rest = rest
+        self.id = next_snowflake()
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.message = message
+        self.created_at = discord.utils.utcnow()
+        self.started = time.perf_counter()
+        self.replies: list = []
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
@@ -1,1234 +1,4187 @@
-
-# ================== ID CONFIG ==================
-
-# SSU / SSD
-SSU_REQUIRED_ROLE_ID = 1054172988318158949
-SSU_SSD_TARGET_CHANNEL_ID = 1203290074645790730  # same for SSU + SSD
-
-# Warrant
-CREATE_WARRANT_ROLE_ID = 1380992005089263717
-WARRANT_BUTTON_ALLOWED_ROLES = {
-    1444775839567708260,
-    1444775731031838750,
-    1213814988251070525,
-}
-WARRANT_CHANNEL_ID = 1444673525167161374
-
-# Moderation
-MOD_REQUIRED_ROLE_ID = 1207461773532471407
-MOD_LOG_CHANNEL_ID = 1347593236952125503
-
-# Citation
-CITATION_REQUIRED_ROLE_ID = 1380992005089263717
-CITATION_CHANNEL_ID = 1444675977706868879
-
-# Arrest
-ARREST_REQUIRED_ROLE_ID = 1380992005089263717
-ARREST_CHANNEL_ID = 1444676107768041574
-
-# ================== HELPERS ==================
-
-
-def has_role_or_admin(member: discord.Member, role_id: int) -> bool:
-    if member.guild_permissions.administrator:
-        return True
-    return any(role.id == role_id for role in member.roles)
-
-
-# ================== WARRANT VIEW ==================
-
-
-class WarrantView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-
-    async def _button_permission_check(self, interaction: discord.Interaction) -> bool:
-        member = interaction.user
-
-        if not isinstance(member, discord.Member):
-            await interaction.response.send_message(
-                "Could not verify your roles.",
-                ephemeral=True,
-            )
-            return False
-
-        # Admin bypass
-        if member.guild_permissions.administrator:
-            return True
-
-        # Check allowed roles
-        has_role = any(role.id in WARRANT_BUTTON_ALLOWED_ROLES for role in member.roles)
-        if not has_role:
-            await interaction.response.send_message(
-                "You do not have permission to approve or deny warrants.",
-                ephemeral=True,
-            )
-            return False
-
-        return True
-
-    def _disable_buttons(self):
-        for item in self.children:
-            item.disabled = True
-
-    @discord.ui.button(
-        label="Approve",
-        style=discord.ButtonStyle.success,
-        custom_id="warrant_approve",
-    )
-    async def approve_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        if not await self._button_permission_check(interaction):
-            return
-
-        if not interaction.message.embeds:
-            await interaction.response.send_message(
-                "No embed found to update.",
-                ephemeral=True,
-            )
-            return
-
-        embed = interaction.message.embeds[0].copy()
-        embed.color = discord.Color.green()
-        embed.set_author(
-            name=f"Warrant Approved by {interaction.user.display_name}"
-        )
-
-        self._disable_buttons()
-        await interaction.message.edit(embed=embed, view=self)
-
-        await interaction.response.send_message(
-            "Warrant approved.",
-            ephemeral=True,
-        )
-
-    @discord.ui.button(
-        label="Deny",
-        style=discord.ButtonStyle.danger,
-        custom_id="warrant_deny",
-    )
-    async def deny_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        if not await self._button_permission_check(interaction):
-            return
-
-        if not interaction.message.embeds:
-            await interaction.response.send_message(
-                "No embed found to update.",
-                ephemeral=True,
-            )
-            return
-
-        embed = interaction.message.embeds[0].copy()
-        embed.color = discord.Color.red()
-        embed.set_author(
-            name=f"Warrant Denied by {interaction.user.display_name}"
-        )
-
-        self._disable_buttons()
-        await interaction.message.edit(embed=embed, view=self)
-
-        await interaction.response.send_message(
-            "Warrant denied.",
-            ephemeral=True,
-        )
-
-
-# ================== MODERATION CONFIRM VIEWS ==================
-
-
-class DeleteConfirmView(discord.ui.View):
-    def __init__(self, log_channel_id: int, message_id: int, invoker: discord.Member):
-        super().__init__(timeout=60)
-        self.log_channel_id = log_channel_id
-        self.message_id = message_id
-        self.invoker_id = invoker.id
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.invoker_id:
-            await interaction.response.send_message(
-                "You are not allowed to interact with this confirmation.",
-                ephemeral=True,
-            )
-            return False
-        return True
-
-    @discord.ui.button(label="Confirm Delete", style=discord.ButtonStyle.danger)
-    async def confirm(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        guild = interaction.guild
-        if guild is None:
-            await interaction.response.send_message(
-                "Guild not found.",
-                ephemeral=True,
-            )
-            return
-
-        channel = guild.get_channel(self.log_channel_id)
-        if channel is None:
-            await interaction.response.send_message(
-                "Log channel not found.",
-                ephemeral=True,
-            )
-            return
-
-        try:
-            msg = await channel.fetch_message(self.message_id)
-        except discord.NotFound:
-            await interaction.response.send_message(
-                "That moderation log message no longer exists.",
-                ephemeral=True,
-            )
-            return
-
-        await msg.delete()
-        await interaction.response.edit_message(
-            content="Moderation log deleted.",
-            view=None,
-        )
-
-    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
-    async def cancel(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await interaction.response.edit_message(
-            content="Moderation delete cancelled.",
-            view=None,
-        )
-
-
-class EditConfirmView(discord.ui.View):
-    def __init__(
-        self,
-        log_channel_id: int,
-        message_id: int,
-        invoker: discord.Member,
-        new_type: str,
-        new_reason: str,
-    ):
-        super().__init__(timeout=60)
-        self.log_channel_id = log_channel_id
-        self.message_id = message_id
-        self.invoker_id = invoker.id
-        self.new_type = new_type
-        self.new_reason = new_reason
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.invoker_id:
-            await interaction.response.send_message(
-                "You are not allowed to interact with this confirmation.",
-                ephemeral=True,
-            )
-            return False
-        return True
-
-    @discord.ui.button(label="Confirm Edit", style=discord.ButtonStyle.success)
-    async def confirm(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        guild = interaction.guild
-        if guild is None:
-            await interaction.response.send_message(
-                "Guild not found.",
-                ephemeral=True,
-            )
-            return
-
-        channel = guild.get_channel(self.log_channel_id)
-        if channel is None:
-            await interaction.response.send_message(
-                "Log channel not found.",
-                ephemeral=True,
-            )
-            return
-
-        try:
-            msg = await channel.fetch_message(self.message_id)
-        except discord.NotFound:
-            await interaction.response.send_message(
-                "That moderation log message no longer exists.",
-                ephemeral=True,
-            )
-            return
-
-        if not msg.embeds:
-            await interaction.response.send_message(
-                "That message does not contain an embed.",
-                ephemeral=True,
-            )
-            return
-
-        embed = msg.embeds[0]
-
-        new_embed = discord.Embed(title=embed.title, color=embed.color)
-
-        roblox_username = ""
-        moderator = ""
-
-        for field in embed.fields:
-            if field.name == "Roblox Username":
-                roblox_username = field.value
-            if field.name == "Moderator":
-                moderator = field.value
-
-        new_embed.add_field(
-            name="Roblox Username",
-            value=roblox_username or "Unknown",
-            inline=False,
-        )
-        new_embed.add_field(name="Type", value=self.new_type, inline=False)
-        new_embed.add_field(name="Reason", value=self.new_reason, inline=False)
-        new_embed.add_field(
-            name="Moderator", value=moderator or "Unknown", inline=False
-        )
-
-        if embed.footer and embed.footer.text:
-            new_embed.set_footer(text=embed.footer.text)
-
-        await msg.edit(embed=new_embed)
-
-        await interaction.response.edit_message(
-            content="Moderation log updated.",
-            view=None,
-        )
-
-    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
-    async def cancel(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        await interaction.response.edit_message(
-            content="Moderation edit cancelled.",
-            view=None,
-        )
-
-
-# ================== BOT CORE ==================
-
-
-class ManagementBot(discord.Client):
-    def __init__(self):
-        intents = discord.Intents.default()
-        intents.members = True
-        super().__init__(intents=intents)
-        self.tree = app_commands.CommandTree(self)
-
-    async def on_ready(self):
-        print(f"Logged in as {self.user} (SLCWL Management)")
-        self.add_view(WarrantView())  # persistent warrant buttons
-        await self.tree.sync()
-        print("Slash commands synced.")
-
-
-bot = ManagementBot()
-
-# ================== SSU / SSD ==================
-
-
-@bot.tree.command(name="ssu", description="Send the SSU announcement.")
-async def ssu(interaction: discord.Interaction):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, SSU_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(SSU_SSD_TARGET_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the SSU announcement channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(
-        title="Server Start-Up",
-        description=(
-            "Our whitelisted server has now started up. We highly recommend you review our "
-            "<#1213248186513363004> prior to joining.\n"
-            "\n"
-            "**Server Name:** Salt Lake City Whitelisted\n"
-            "**Code:** slcwl\n"
-            "\n"
-            "If you have voted, you have **15 minutes** to join or you will face moderation actions. "
-            "Ensure to join a voice channel as it is required. To join in-game you must be in our Roblox "
-            "group found [here](https://www.roblox.com/groups/34003840/Salt-Lake-Whitelisted#!/about)."
-        ),
-        color=0x2B2D31,
-    )
-
-    embed.set_image(
-        url="https://media.discordapp.net/attachments/1213251495038951505/1302714930742431784/Screenshot_528-superbloomed.png?ex=69352b92&is=6933da12&hm=85fa0f6a2f2e4e4a95fde9289fb08bedd34e779ade17b2afe8df0b5a2880c87d&=&format=webp&quality=lossless&width=550&height=235"
-    )
-    embed.set_footer(text="Salt Lake City Whitelisted")
-
-    await channel.send(
-        content="@everyone",
-        embed=embed,
-        allowed_mentions=discord.AllowedMentions(everyone=True),
-    )
-
-    await interaction.response.send_message(
-        f"SSU announcement sent in {channel.mention}.",
-        ephemeral=True,
-    )
-
-
-@bot.tree.command(name="ssd", description="Send the SSD announcement.")
-async def ssd(interaction: discord.Interaction):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, SSU_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(SSU_SSD_TARGET_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the SSD announcement channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(
-        title="Server Shut Down",
-        description=(
-            "Our whitelisted server has now shut down. Thank you for joining. We hope you enjoyed our session.\n"
-            "\n"
-            "Ensure to stay on the lookout for future whitelisted sessions."
-        ),
-        color=0x2B2D31,
-    )
-
-    embed.set_image(
-        url="https://media.discordapp.net/attachments/1213251495038951505/1302714930742431784/Screenshot_528-superbloomed.png?ex=69352b92&is=6933da12&hm=85fa0f6a2f2e4e4a95fde9289fb08bedd34e779ade17b2afe8df0b5a2880c87d&=&format=webp&quality=lossless&width=550&height=235"
-    )
-    embed.set_footer(text="Salt Lake City Whitelisted")
-
-    await channel.send(embed=embed)
-
-    await interaction.response.send_message(
-        f"SSD announcement sent in {channel.mention}.",
-        ephemeral=True,
-    )
-
-
-# ================== WARRANT COMMANDS ==================
-
-
-@bot.tree.command(name="warrant", description="Create a warrant request.")
-@app_commands.describe(
-    suspect_username="Suspect's username",
-    charges="List the charges",
-)
-async def warrant(
-    interaction: discord.Interaction, suspect_username: str, charges: str
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command must be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, CREATE_WARRANT_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to create warrants.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(WARRANT_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the warrant channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(
-        description=(
-            f"**User Requested:** {member.mention}\n"
-            f"**Suspect's Username:** {suspect_username}\n"
-            f"**Charges:** {charges}"
-        ),
-        color=discord.Color.blurple(),
-    )
-    embed.set_author(name="Warrant Pending")
-
-    view = WarrantView()
-
-    message = await channel.send(embed=embed, view=view)
-
-    embed.set_footer(text=f"Warrant ID: {message.id}")
-    await message.edit(embed=embed)
-
-    await interaction.response.send_message(
-        f"Warrant created in {channel.mention}",
-        ephemeral=True,
-    )
-
-
-@bot.tree.command(
-    name="warrant_lookup",
-    description="Look up a warrant by its ID.",
-)
-@app_commands.describe(
-    warrant_id="The Warrant ID found in the embed footer",
-)
-async def warrant_lookup(interaction: discord.Interaction, warrant_id: str):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command must be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(WARRANT_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the warrant channel.",
-            ephemeral=True,
-        )
-        return
-
-    try:
-        message = await channel.fetch_message(int(warrant_id))
-    except Exception:
-        await interaction.response.send_message(
-            "No warrant found with that ID.",
-            ephemeral=True,
-        )
-        return
-
-    if not message.embeds:
-        await interaction.response.send_message(
-            "This message does not contain a valid warrant.",
-            ephemeral=True,
-        )
-        return
-
-    embed = message.embeds[0]
-
-    await interaction.response.send_message(embed=embed, ephemeral=True)
-
-
-# ================== MODERATION COMMANDS ==================
-
-
-async def get_mod_log_channel(guild: discord.Guild):
-    return guild.get_channel(MOD_LOG_CHANNEL_ID)
-
-
-@bot.tree.command(
-    name="log_moderation",
-    description="Log a moderation action for a Roblox user.",
-)
-@app_commands.describe(
-    roblox_username="Roblox username of the user being moderated",
-    mod_type="Type of moderation (e.g., Strike 1, Strike 2, Removal)",
-    reason="Reason for the moderation action",
-)
-async def log_moderation(
-    interaction: discord.Interaction,
-    roblox_username: str,
-    mod_type: str,
-    reason: str,
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, MOD_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    log_channel = await get_mod_log_channel(interaction.guild)
-    if log_channel is None:
-        await interaction.response.send_message(
-            "Could not find the moderation log channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(title="Moderation Log", color=discord.Color.blurple())
-    embed.add_field(
-        name="Roblox Username", value=roblox_username, inline=False
-    )
-    embed.add_field(name="Type", value=mod_type, inline=False)
-    embed.add_field(name="Reason", value=reason, inline=False)
-    embed.add_field(name="Moderator", value=member.mention, inline=False)
-
-    message = await log_channel.send(embed=embed)
-
-    embed.set_footer(text=f"Moderation ID: {message.id}")
-    await message.edit(embed=embed)
-
-    await interaction.response.send_message(
-        f"Moderation logged in {log_channel.mention} with ID {message.id}.",
-        ephemeral=True,
-    )
-
-
-@bot.tree.command(
-    name="moderation_logs",
-    description="View moderation logs for a Roblox user.",
-)
-@app_commands.describe(
-    roblox_username="Roblox username to search for",
-)
-async def moderation_logs(
-    interaction: discord.Interaction, roblox_username: str
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, MOD_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    log_channel = await get_mod_log_channel(interaction.guild)
-    if log_channel is None:
-        await interaction.response.send_message(
-            "Could not find the moderation log channel.",
-            ephemeral=True,
-        )
-        return
-
-    roblox_lower = roblox_username.lower()
-    matches = []
-
-    async for msg in log_channel.history(limit=1000):
-        if not msg.embeds:
-            continue
-        embed = msg.embeds[0]
-        for field in embed.fields:
-            if (
-                field.name == "Roblox Username"
-                and field.value.lower() == roblox_lower
-            ):
-                case_id = msg.id
-                mod_type = next(
-                    (f.value for f in embed.fields if f.name == "Type"),
-                    "Unknown",
-                )
-                reason = next(
-                    (f.value for f in embed.fields if f.name == "Reason"),
-                    "Unknown",
-                )
-                moderator = next(
-                    (f.value for f in embed.fields if f.name == "Moderator"),
-                    "Unknown",
-                )
-                matches.append(
-                    (case_id, mod_type, reason, moderator, msg.jump_url)
-                )
-                break
-
-    if not matches:
-        await interaction.response.send_message(
-            f"No moderation logs found for Roblox user '{roblox_username}'.",
-            ephemeral=True,
-        )
-        return
-
-    lines = [f"Moderation logs for Roblox user '{roblox_username}':", ""]
-    for case_id, mod_type, reason, moderator, jump_url in matches:
-        lines.append(f"ID: {case_id}")
-        lines.append(f"Type: {mod_type}")
-        lines.append(f"Reason: {reason}")
-        lines.append(f"Moderator: {moderator}")
-        lines.append(f"Link: {jump_url}")
-        lines.append("")
-
-    text = "\n".join(lines)
-
-    await interaction.response.send_message(text, ephemeral=True)
-
-
-@bot.tree.command(
-    name="moderation_delete",
-    description="Delete a moderation log by its ID.",
-)
-@app_commands.describe(
-    moderation_id="The Moderation ID (shown in the log footer)",
-)
-async def moderation_delete(
-    interaction: discord.Interaction, moderation_id: str
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, MOD_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    log_channel = await get_mod_log_channel(interaction.guild)
-    if log_channel is None:
-        await interaction.response.send_message(
-            "Could not find the moderation log channel.",
-            ephemeral=True,
-        )
-        return
-
-    try:
-        msg = await log_channel.fetch_message(int(moderation_id))
-    except Exception:
-        await interaction.response.send_message(
-            "No moderation log found with that ID.",
-            ephemeral=True,
-        )
-        return
-
-    if not msg.embeds:
-        await interaction.response.send_message(
-            "That message does not contain a moderation embed.",
-            ephemeral=True,
-        )
-        return
-
-    embed = msg.embeds[0]
-    summary = [f"Moderation ID: {moderation_id}"]
-    for field in embed.fields:
-        summary.append(f"{field.name}: {field.value}")
-
-    text = "\n".join(summary)
-
-    view = DeleteConfirmView(MOD_LOG_CHANNEL_ID, int(moderation_id), member)
-
-    await interaction.response.send_message(
-        f"You are about to delete this moderation log:\n\n{text}",
-        view=view,
-        ephemeral=True,
-    )
-
-
-@bot.tree.command(
-    name="moderation_edit",
-    description="Edit a moderation log by its ID.",
-)
-@app_commands.describe(
-    moderation_id="The Moderation ID (shown in the log footer)",
-    new_type="New moderation type (e.g., Strike 1, Strike 2, Removal)",
-    new_reason="New reason for the moderation action",
-)
-async def moderation_edit(
-    interaction: discord.Interaction,
-    moderation_id: str,
-    new_type: str,
-    new_reason: str,
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, MOD_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    log_channel = await get_mod_log_channel(interaction.guild)
-    if log_channel is None:
-        await interaction.response.send_message(
-            "Could not find the moderation log channel.",
-            ephemeral=True,
-        )
-        return
-
-    try:
-        msg = await log_channel.fetch_message(int(moderation_id))
-    except Exception:
-        await interaction.response.send_message(
-            "No moderation log found with that ID.",
-            ephemeral=True,
-        )
-        return
-
-    if not msg.embeds:
-        await interaction.response.send_message(
-            "That message does not contain a moderation embed.",
-            ephemeral=True,
-        )
-        return
-
-    embed = msg.embeds[0]
-
-    summary = [f"Moderation ID: {moderation_id}"]
-    for field in embed.fields:
-        summary.append(f"{field.name}: {field.value}")
-    summary.append("")
-    summary.append("New values:")
-    summary.append(f"Type: {new_type}")
-    summary.append(f"Reason: {new_reason}")
-
-    text = "\n".join(summary)
-
-    view = EditConfirmView(
-        MOD_LOG_CHANNEL_ID,
-        int(moderation_id),
-        member,
-        new_type,
-        new_reason,
-    )
-
-    await interaction.response.send_message(
-        f"You are about to edit this moderation log:\n\n{text}",
-        view=view,
-        ephemeral=True,
-    )
-
-
-# ================== CITATION ==================
-
-
-@bot.tree.command(
-    name="citation_log",
-    description="Log a citation for a suspect.",
-)
-@app_commands.describe(
-    suspect_username="Suspect's Roblox username",
-    reason="Reason for the citation",
-    fine_amount="Fine amount (e.g. 5,000 or 10k)",
-)
-async def citation_log(
-    interaction: discord.Interaction,
-    suspect_username: str,
-    reason: str,
-    fine_amount: str,
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, CITATION_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(CITATION_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the citation log channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(title="Citation Log", color=discord.Color.blurple())
-    embed.add_field(
-        name="Suspect's Roblox Username",
-        value=suspect_username,
-        inline=False,
-    )
-    embed.add_field(name="Reason", value=reason, inline=False)
-    embed.add_field(name="Fine Amount", value=fine_amount, inline=False)
-    embed.add_field(
-        name="Issuing Officer", value=member.mention, inline=False
-    )
-
-    message = await channel.send(embed=embed)
-
-    embed.set_footer(text=f"Citation ID: {message.id}")
-    await message.edit(embed=embed)
-
-    await interaction.response.send_message(
-        f"Citation logged in {channel.mention} with ID {message.id}.",
-        ephemeral=True,
-    )
-
-
-# ================== ARREST ==================
-
-
-@bot.tree.command(
-    name="arrest_log",
-    description="Log an arrest for a suspect.",
-)
-@app_commands.describe(
-    suspect_username="Suspect's Roblox username",
-    charges="Charges for the arrest (e.g. 1x evasion, 2x reckless driving)",
-)
-async def arrest_log(
-    interaction: discord.Interaction, suspect_username: str, charges: str
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-        )
-        return
-
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, ARREST_REQUIRED_ROLE_ID):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    channel = interaction.guild.get_channel(ARREST_CHANNEL_ID)
-    if channel is None:
-        await interaction.response.send_message(
-            "Could not find the arrest log channel.",
-            ephemeral=True,
-        )
-        return
-
-    embed = discord.Embed(title="Arrest Log", color=discord.Color.blurple())
-    embed.add_field(
-        name="Suspect's Roblox Username",
-        value=suspect_username,
-        inline=False,
-    )
-    embed.add_field(
-        name="Charges", value=charges, inline=False)
-    embed.add_field(
-        name="Arresting Officer", value=member.mention, inline=False
-    )
-
-    message = await channel.send(embed=embed)
-
-    embed.set_footer(text=f"Arrest ID: {message.id}")
-    await message.edit(embed=embed)
-
-    await interaction.response.send_message(
-        f"Arrest logged in {channel.mention} with ID {message.id}.",
-        ephemeral=True,
-    )
-
-# Session Vote Thing
-
-SSUVOTE_REQUIRED_ROLE_IDS = {
-    1207461773532471407,
-    1054172988318158949,
-
-}
-
-class SSUVoteView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)
-        self.attendees: set[int] = set()
-
-        self.view_allowed_roles = {
-            1207461773532471407,
-            1054172988318158949,
-        }
-
-    # ✅ ATTEND / UNATTEND BUTTON
-    @discord.ui.button(
-        label="Attend Session",
-        style=discord.ButtonStyle.success
-    )
-    async def attend_button(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button
-    ):
-        user_id = interaction.user.id
-
-        if user_id in self.attendees:
-            self.attendees.remove(user_id)
-            await interaction.response.send_message(
-                "<:whitecheck:1191923481928028200> Sucessfully unmarked your attendance.",
-                ephemeral=True
-            )
-        else:
-            self.attendees.add(user_id)
-            await interaction.response.send_message(
-                "<:whitecheck:1191923481928028200> Successfully marked your attendance..",
-                ephemeral=True
-            )
-
-    # ⬜ VIEW ATTENDEES BUTTON
-    @discord.ui.button(
-        label="View Attendees",
-        style=discord.ButtonStyle.secondary
-    )
-    async def view_attendees_button(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button
-    ):
-        user_role_ids = {role.id for role in interaction.user.roles}
-
-        if not user_role_ids & self.view_allowed_roles:
-            await interaction.response.send_message(
-                "You do not have permission to view attendees.",
-                ephemeral=True
-            )
-            return
-
-        if not self.attendees:
-            await interaction.response.send_message(
-                "No one has marked attendance yet.",
-                ephemeral=True
-            )
-            return
-
-        mentions = []
-        for user_id in self.attendees:
-            mentions.append(f"<@{user_id}>")
-
-        attendee_list = "\n".join(mentions)
-
-        await interaction.response.send_message(
-            f"**Attendees ({len(self.attendees)}):**\n{attendee_list}",
-            ephemeral=True
-        )
-
-
-@bot.tree.command(
-    name = "ssu_vote",
-    description = "Start a session vote.".
-
-)
-@app_commands.describe(
-    session_time="Enter the time using a timestamp generator."
-
-)
-async def ssu_vote(
-    interaction: discord.Interaction, session_time: str,
-
-):
-    if interaction.guild is None:
-        await interaction.response.send_message(
-            "This command can only be used in a server.",
-            ephemeral=True,
-
-        )
-        return
-    member = interaction.user
-    if not isinstance(member, discord.Member):
-        await interaction.response.send_message(
-            "Could not verify your roles.",
-            ephemeral=True,
-        )
-        return
-
-    if not has_role_or_admin(member, SSUVOTE_REQUIRED_ROLE_IDS):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-embed = discord.Embed(
-    title="Session Vote",
-    description=(
-        "A session vote is being held. The time for the session is listed below. If you plan to attend, please use the green button listed below to mark your attendance. If you fail to join the session within **15** minutes of it starting after voting, you will be moderated.")
-    color=0x232428
-
-    )
-    embed.add_field(name=Session Time, vlaue=session_time, inline=False)
-
-    message = await channel.send(
-    embed=embed,
-    view=SSUVoteView()
-)
-
-
-    embed.set_footer(text=f"Arrest ID: {message.id}")
-    await message.edit(embed=embed)
-
-    await interaction.response.send_message(
-        f"Successfully ran the session vote command.",
-        ephemeral=True,
-    )
-
-# FETCH INFRACTIONS
-
-FETCH_REACTIONS_REQUIRED_ROLE_ID = 1207461773532471407
-@bot.tree.command(
-    name="fetch_reactions",
-    description="Fetch users who reacted to a message and mention them.",
-)
-@app_commands.describe(
-    message_id="The ID of the message to fetch reactions from",
-    emoji="The emoji reaction to check (✅ or <:name:id>)",
-)
-async def fetch_reactions(
-    interaction: discord.Interaction,
-    message_id: str,
-    emoji: str,
-):
-    member = interaction.user
-
-    if not (
-        member.guild_permissions.administrator
-        or any(role.id == FETCH_REACTIONS_REQUIRED_ROLE_ID for role in member.roles)
-    ):
-        await interaction.response.send_message(
-            "You do not have permission to use this command.",
-            ephemeral=True,
-        )
-        return
-
-    try:
-        message = await interaction.channel.fetch_message(int(message_id))
-    except Exception:
-        await interaction.response.send_message(
-            "Could not find a message with that ID in this channel.",
-            ephemeral=True,
-        )
-        return
-
-    target_reaction = None
-    for reaction in message.reactions:
-        if str(reaction.emoji) == emoji:
-            target_reaction = reaction
-            break
-
-    if target_reaction is None:
-        await interaction.response.send_message(
-            "That reaction was not found on the message.",
-            ephemeral=True,
-        )
-        return
-
-    users = []
-    async for user in target_reaction.users():
-        if not user.bot:
-            users.append(user)
-
-    if not users:
-        await interaction.response.send_message(
-            "No users have reacted with that emoji.",
-            ephemeral=True,
-        )
-        return
-
-    mentions = " ".join(user.mention for user in users)
-
-    await interaction.response.send_message(
-        f"**Users who reacted ({len(users)}):**\n{mentions}",
-        ephemeral=True,
-    )
-
-
-# ================== RUN BOT ==================
-
-import os
-
-if __name__ == "__main__":
-    token = os.getenv("BOT_TOKEN")
-    if not token:
-        raise RuntimeError("BOT_TOKEN environment variable not set")
-    bot.run(token)
+import asyncio
+import contextlib
+import contextvars
+import csv
+import dataclasses
+import datetime
+import functools
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import traceback
+import types
+from collections import Counter, defaultdict, deque
+from decimal import Decimal, DecimalException, Inexact, localcontext
+from typing import Literal
+
+import discord
+from aiohttp import web
+from discord import app_commands
+
+# ================== ID CONFIG ==================
+
+# Channel and role IDs live in config.json (see BotConfig) and are reloaded
+# while the bot runs whenever the file changes.
+CONFIG_PATH = os.getenv(
+    "CONFIG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json"),
+)
+CONFIG_POLL_SECONDS = 0.5
+
+# Session attendance check: vote attendees missing from voice are reported
+NO_SHOW_GRACE_SECONDS = 15 * 60
+# /ssu only picks up a vote held within this long before it
+SESSION_VOTE_MAX_AGE_SECONDS = 12 * 60 * 60
+NO_SHOW_CHECK_SECONDS = 60.0
+
+# Local case store
+CASE_DB_PATH = os.getenv("CASE_DB_PATH", "slcwl.db")
+MOD_LOG_SYNC_BATCH_SIZE = 100
+VOTE_FLUSH_SECONDS = 2.0
+VOTE_COUNTER_EDIT_SECONDS = 5.0
+
+# Embed templates (announcement, log and warrant embeds)
+TEMPLATES_PATH = os.getenv(
+    "TEMPLATES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates.json"),
+)
+
+# Outbound message queue: concurrent sends/edits per channel
+OUTBOUND_CHANNEL_CONCURRENCY = 5
+
+# Gateway shards; 0 lets Discord recommend a count
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+
+# Gateway intents and member/message caching: "full", "lazy" or "minimal"
+CACHE_PROFILE = os.getenv("CACHE_PROFILE", "lazy")
+
+# Optional guild that also gets a guild-scoped copy of the commands (changes
+# show up there instantly, next to the global ones)
+SYNC_GUILD_ID = int(os.getenv("SYNC_GUILD_ID", "0"))
+
+# Local status endpoint (Prometheus metrics); set STATUS_PORT=0 to disable
+STATUS_HOST = os.getenv("STATUS_HOST", "127.0.0.1")
+STATUS_PORT = int(os.getenv("STATUS_PORT", "9108"))
+
+# ================== CONFIG ==================
+
+
+@dataclasses.dataclass(frozen=True)
+class BotConfig:
+    """One guild's channel and role IDs, parsed and validated from ``config.json``.
+
+    Instances are immutable; a reload builds new ones and rebinds the
+    module-level ``configs``, so code that reads ``config.<field>`` when it
+    runs always sees one complete version of the file.
+    """
+
+    ssu_required_role_id: int
+    ssu_ssd_target_channel_id: int  # same for SSU + SSD
+    ssu_vote_required_role_ids: frozenset[int]
+    create_warrant_role_id: int
+    warrant_button_allowed_roles: frozenset[int]
+    warrant_channel_id: int
+    mod_required_role_id: int
+    mod_log_channel_id: int
+    citation_required_role_id: int
+    citation_channel_id: int
+    arrest_required_role_id: int
+    arrest_channel_id: int
+    fetch_reactions_required_role_id: int
+    session_voice_channel_ids: frozenset[int]  # empty: any voice channel counts
+    no_show_report_channel_id: int  # 0: no automatic no-show reports
+    templates_path: str = ""  # relative to config.json; empty: TEMPLATES_PATH
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BotConfig":
+        fields = {field.name: field.type for field in dataclasses.fields(cls)}
+        required = {
+            field.name
+            for field in dataclasses.fields(cls)
+            if field.default is dataclasses.MISSING
+        }
+        unknown = data.keys() - fields.keys()
+        missing = required - data.keys()
+        if unknown:
+            raise ValueError(f"unknown keys {sorted(unknown)}")
+        if missing:
+            raise ValueError(f"missing keys {sorted(missing)}")
+
+        def snowflake(name: str, value) -> int:
+            if isinstance(value, str) and value.isdigit():
+                return int(value)
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+            raise ValueError(f"{name}: {value!r} is not a Discord ID")
+
+        values = {}
+        for name, value in data.items():
+            if fields[name] is int:
+                values[name] = snowflake(name, value)
+            elif fields[name] is str:
+                if not isinstance(value, str):
+                    raise ValueError(f"{name}: expected a string")
+                values[name] = value
+            elif isinstance(value, list):
+                values[name] = frozenset(snowflake(name, item) for item in value)
+            else:
+                raise ValueError(f"{name}: expected a list of Discord IDs")
+        report_channel_id = values.get("no_show_report_channel_id")
+        if report_channel_id and report_channel_id == values.get("mod_log_channel_id"):
+            # The mod-log sync would read the plain-text reports as cases.
+            raise ValueError(
+                "no_show_report_channel_id: must not be the mod-log channel"
+            )
+        return cls(**values)
+
+    def role_ids(self, *names: str) -> frozenset[int]:
+        """Union of the named role fields, each a single ID or a set of IDs."""
+        return _role_ids(self, names)
+
+
+@functools.lru_cache(maxsize=128)
+def _role_ids(config: BotConfig, names: tuple[str, ...]) -> frozenset[int]:
+    # Keyed by the config object itself, so a reload re-keys every lookup.
+    role_ids = set()
+    for name in names:
+        value = getattr(config, name)
+        role_ids.update(value if isinstance(value, frozenset) else (value,))
+    return frozenset(role_ids)
+
+
+@dataclasses.dataclass(frozen=True)
+class GuildConfigs:
+    """The top-level config plus one ``BotConfig`` per entry under ``guilds``.
+
+    Each ``guilds`` entry only lists what differs from the top level. Guilds
+    without an entry share the top-level config (and the default store).
+    """
+
+    default: BotConfig
+    guilds: types.MappingProxyType  # guild ID -> BotConfig
+
+    @classmethod
+    def load(cls, path: str) -> "GuildConfigs":
+        with open(path, encoding="utf-8") as fp:
+            data = json.load(fp)
+        sections = data.pop("guilds", {})
+        guilds = {}
+        for guild_id, section in sections.items():
+            if not guild_id.isdigit():
+                raise ValueError(f"guilds: {guild_id!r} is not a guild ID")
+            try:
+                guilds[int(guild_id)] = BotConfig.from_dict({**data, **section})
+            except ValueError as exc:
+                raise ValueError(f"guilds.{guild_id}: {exc}") from None
+        return cls(BotConfig.from_dict(data), types.MappingProxyType(guilds))
+
+    def for_guild(self, guild_id: int | None) -> BotConfig:
+        return self.guilds.get(guild_id, self.default)
+
+    def all(self) -> tuple[BotConfig, ...]:
+        return (self.default, *self.guilds.values())
+
+
+configs = GuildConfigs.load(CONFIG_PATH)
+
+
+def config_for(guild_id: int | None) -> BotConfig:
+    return configs.for_guild(guild_id)
+
+
+class ConfigWatcher:
+    """Polls ``config.json`` and swaps in new ``GuildConfigs`` when it changes.
+
+    A file that fails to parse or validate is reported and ignored, leaving
+    the running config in place. Validators are called as
+    ``validator(old, new)`` before the swap and reject the file by raising
+    ``OSError``, ``ValueError`` or ``KeyError``; listeners are called the same
+    way after it. A failing listener is logged and does not stop the others.
+    """
+
+    def __init__(self, path: str, interval: float = CONFIG_POLL_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.validators: list = []
+        self.listeners: list = []
+        self.stamp = self._stamp()
+
+    def _stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> bool:
+        global configs
+        stamp = self._stamp()
+        if stamp is None or stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        try:
+            new = GuildConfigs.load(self.path)
+            if new == configs:
+                return False
+            for validator in self.validators:
+                validator(configs, new)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Config reload failed, keeping the current config: {exc}")
+            return False
+        old, configs = configs, new
+        for listener in self.listeners:
+            try:
+                listener(old, new)
+            except Exception:
+                print("Config reload listener failed:")
+                traceback.print_exc()
+        print("Config reloaded.")
+        return True
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+
+config_watcher = ConfigWatcher(CONFIG_PATH)
+
+
+# ================== PERMISSIONS ==================
+
+
+class PermissionResolver:
+    """Caches each member's role IDs as a frozenset, keyed by guild and member.
+
+    A permission check is then one admin flag test plus a set intersection.
+    Entries are dropped on member updates/removals and, per guild, on role
+    updates/deletions (which can change the administrator flag). Those member
+    events only arrive for members in the gateway's member cache (see
+    ``CacheProfile``), so anyone else's roles are read fresh from the
+    interaction on every check instead of being cached.
+    """
+
+    def __init__(self):
+        self.cache: dict[tuple[int, int], tuple[bool, frozenset[int]]] = {}
+
+    def resolve(
+        self, guild: discord.Guild, member: discord.Member
+    ) -> tuple[bool, frozenset[int]]:
+        key = (guild.id, member.id)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = (
+                member.guild_permissions.administrator,
+                frozenset(role.id for role in member.roles),
+            )
+            if cache_profile.members_intent and guild.get_member(member.id):
+                self.cache[key] = entry
+        return entry
+
+    def allowed(
+        self, guild: discord.Guild, member: discord.Member, role_ids: frozenset[int]
+    ) -> bool:
+        administrator, member_roles = self.resolve(guild, member)
+        return administrator or not member_roles.isdisjoint(role_ids)
+
+    def invalidate_member(self, guild_id: int, member_id: int):
+        self.cache.pop((guild_id, member_id), None)
+
+    def invalidate_guild(self, guild_id: int):
+        for key in [key for key in self.cache if key[0] == guild_id]:
+            del self.cache[key]
+
+
+permissions = PermissionResolver()
+
+
+class MissingCommandRole(app_commands.CheckFailure):
+    """Raised by ``require_roles`` checks; the message is shown to the user."""
+
+
+class GuildNotServed(app_commands.CheckFailure):
+    """Raised for commands from a guild with no namespace (see ``GuildStates``)."""
+
+
+def check_guild_served(interaction: discord.Interaction):
+    if interaction.guild is None:
+        raise app_commands.NoPrivateMessage(
+            "This command can only be used in a server."
+        )
+    if not guild_states.serves(interaction.guild):
+        raise GuildNotServed("This server is not set up for this bot.")
+
+
+def guild_served_only():
+    """Command check: guild only, and only a guild the bot keeps data for."""
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        check_guild_served(interaction)
+        return True
+
+    return app_commands.check(predicate)
+
+
+async def check_member_roles(
+    interaction: discord.Interaction, role_ids: frozenset[int], message: str
+) -> bool:
+    check_guild_served(interaction)
+    member = interaction.user
+    if not isinstance(member, discord.Member):
+        raise MissingCommandRole("Could not verify your roles.")
+    if not permissions.allowed(interaction.guild, member, role_ids):
+        raise MissingCommandRole(message)
+    return True
+
+
+def require_roles(
+    *role_fields: str,
+    message: str = "You do not have permission to use this command.",
+):
+    """Command check: served guild only, and the invoker needs one of the roles.
+
+    ``role_fields`` name ``BotConfig`` fields and are looked up in the current
+    config on every check, so role changes apply without a restart.
+    Administrators always pass. Failures are reported to the user by the
+    tree's error handler.
+    """
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        role_ids = config_for(interaction.guild_id).role_ids(*role_fields)
+        return await check_member_roles(interaction, role_ids, message)
+
+    return app_commands.check(predicate)
+
+
+# ================== METRICS ==================
+
+# Discord fails the interaction if it is not acknowledged within 3 seconds.
+ACK_WARN_SECONDS = 2.0
+METRIC_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Invocation:
+    """Per-command-invocation counters, carried in a context variable."""
+
+    __slots__ = ("command", "rest_calls", "rate_limited")
+
+    def __init__(self, command: str):
+        self.command = command
+        self.rest_calls = 0
+        self.rate_limited = 0
+
+
+current_invocation: contextvars.ContextVar[Invocation | None] = (
+    contextvars.ContextVar("current_invocation", default=None)
+)
+
+
+def quantile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class CommandMetrics:
+    """Latency, REST-call and rate-limit counters per slash command.
+
+    Latency and REST-calls-per-invocation keep a rolling window of recent
+    samples for the quantiles; everything else is a running total. Calls made
+    outside a command (syncs, background loops) are counted as "background".
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        def window():
+            return deque(maxlen=max_samples)
+
+        self.ack_latency: dict[str, deque[float]] = defaultdict(window)
+        self.latency: dict[str, deque[float]] = defaultdict(window)
+        self.rest_per_invocation: dict[str, deque[int]] = defaultdict(window)
+        self.invocations: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.ack_failures: Counter[str] = Counter()
+        self.rest_calls: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+
+    def _command(self) -> str:
+        invocation = current_invocation.get()
+        return invocation.command if invocation else "background"
+
+    def record_rest_call(self):
+        invocation = current_invocation.get()
+        if invocation is not None:
+            invocation.rest_calls += 1
+        self.rest_calls[self._command()] += 1
+
+    def record_rate_limit(self):
+        invocation = current_invocation.get()
+        if invocation is not None:
+            invocation.rate_limited += 1
+        self.rate_limited[self._command()] += 1
+
+    def record_invocation(
+        self, invocation: Invocation, ack: float | None, total: float, failed: bool
+    ):
+        """Record one command run; ``ack`` is None if it was never acknowledged."""
+        command = invocation.command
+        self.invocations[command] += 1
+        if failed:
+            self.errors[command] += 1
+        if ack is None:
+            self.ack_failures[command] += 1
+            print(f"/{command} could not be acknowledged after {total:.2f}s")
+        else:
+            self.ack_latency[command].append(ack)
+            if ack > ACK_WARN_SECONDS:
+                print(f"/{command} acknowledged after {ack:.2f}s")
+        self.latency[command].append(total)
+        self.rest_per_invocation[command].append(invocation.rest_calls)
+
+    def render_prometheus(self) -> str:
+        lines = []
+
+        def summary(name: str, help_text: str, samples: dict[str, deque]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for command, values in sorted(samples.items()):
+                ordered = sorted(values)
+                for q in METRIC_QUANTILES:
+                    lines.append(
+                        f'{name}{{command="{command}",quantile="{q}"}} '
+                        f"{quantile(ordered, q):.6f}"
+                    )
+                lines.append(f'{name}_sum{{command="{command}"}} {sum(ordered):.6f}')
+                lines.append(f'{name}_count{{command="{command}"}} {len(ordered)}')
+
+        def counter(name: str, help_text: str, counts: Counter[str]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for command, value in sorted(counts.items()):
+                lines.append(f'{name}{{command="{command}"}} {value}')
+
+        summary(
+            "slcwl_command_ack_seconds",
+            "Time from interaction creation to acknowledgement.",
+            self.ack_latency,
+        )
+        summary(
+            "slcwl_command_seconds",
+            "Time from interaction creation to command completion.",
+            self.latency,
+        )
+        summary(
+            "slcwl_command_rest_calls",
+            "Discord REST calls made per command invocation.",
+            self.rest_per_invocation,
+        )
+        counter(
+            "slcwl_command_invocations_total",
+            "Slash command invocations.",
+            self.invocations,
+        )
+        counter(
+            "slcwl_command_errors_total",
+            "Slash command invocations that raised.",
+            self.errors,
+        )
+        counter(
+            "slcwl_command_ack_failures_total",
+            "Slash command invocations whose acknowledgement (defer) failed.",
+            self.ack_failures,
+        )
+        counter("slcwl_rest_calls_total", "Discord REST calls.", self.rest_calls)
+        counter(
+            "slcwl_rest_rate_limited_total",
+            "Discord REST responses that were rate limited (HTTP 429).",
+            self.rate_limited,
+        )
+        return "\n".join(lines) + "\n"
+
+
+metrics = CommandMetrics()
+
+
+class RateLimitLogHandler(logging.Handler):
+    """Counts the 429 warnings discord.py logs before it sleeps and retries.
+
+    Only the per-response retry warning is counted: discord.py also logs
+    "Global rate limit has been hit" for the same global 429, and a 429 whose
+    wait is too long is raised as ``RateLimited`` rather than retried.
+    """
+
+    RETRY_MESSAGE = (
+        "We are being rate limited. %s %s responded with 429. "
+        "Retrying in %.2f seconds."
+    )
+
+    def emit(self, record: logging.LogRecord):
+        if record.msg == self.RETRY_MESSAGE:
+            metrics.record_rate_limit()
+
+
+def instrument_http(http: discord.http.HTTPClient):
+    """Count every bot REST request against the running command.
+
+    Interaction responses and followups go through the interaction webhook
+    rather than ``HTTPClient.request`` and are not counted here.
+    """
+    request = http.request
+
+    @functools.wraps(request)
+    async def counted_request(*args, **kwargs):
+        metrics.record_rest_call()
+        return await request(*args, **kwargs)
+
+    http.request = counted_request
+
+    rate_limit_handler = RateLimitLogHandler(logging.WARNING)
+    logging.getLogger("discord.http").addHandler(rate_limit_handler)
+
+
+# Startup phases that must all finish before /ready reports ready.
+READY_PHASES = ("setup", "gateway", "command_sync")
+
+
+def process_age() -> float:
+    """Seconds since this process started (Linux), or 0 where unknown."""
+    try:
+        with open("/proc/self/stat") as stat:
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            up_for = float(uptime.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return max(0.0, up_for - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+class StartupTimeline:
+    """When each startup phase began and ended, in seconds from process start.
+
+    Phases can overlap (the command sync runs while the gateway connects), so
+    each keeps its own span. ``import`` runs from process start until the
+    script hands over to ``bot.run``; beginning or ending a phase twice (e.g.
+    ``on_ready`` after a reconnect) keeps the first time.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter() - process_age()
+        self.spans: dict[str, list[float | None]] = {"import": [0.0, None]}
+        self.completed_at: float | None = None
+
+    def now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def begin(self, phase: str):
+        self.spans.setdefault(phase, [self.now(), None])
+
+    def end(self, phase: str):
+        span = self.spans.setdefault(phase, [self.now(), None])
+        if span[1] is not None:
+            return
+        span[1] = self.now()
+        print(f"Startup: {phase} took {span[1] - span[0]:.2f}s")
+        if self.completed_at is None and all(
+            self.finished(name) for name in READY_PHASES
+        ):
+            self.completed_at = self.now()
+            print(f"Startup complete after {self.completed_at:.2f}s.")
+
+    def finished(self, phase: str) -> bool:
+        span = self.spans.get(phase)
+        return span is not None and span[1] is not None
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    @property
+    def complete(self) -> bool:
+        return self.completed_at is not None
+
+    def report(self) -> dict:
+        return {
+            "uptime": round(self.now(), 3),
+            "startup_seconds": self.completed_at and round(self.completed_at, 3),
+            "phases": {
+                name: {
+                    "started": round(start, 3),
+                    "finished": None if end is None else round(end, 3),
+                }
+                for name, (start, end) in self.spans.items()
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP slcwl_startup_phase_seconds Duration of each startup phase.",
+            "# TYPE slcwl_startup_phase_seconds gauge",
+        ]
+        for name, (start, end) in self.spans.items():
+            if end is not None:
+                lines.append(
+                    f'slcwl_startup_phase_seconds{{phase="{name}"}} {end - start:.6f}'
+                )
+        if self.completed_at is not None:
+            lines.append(
+                "# HELP slcwl_startup_seconds Time from process start to ready."
+            )
+            lines.append("# TYPE slcwl_startup_seconds gauge")
+            lines.append(f"slcwl_startup_seconds {self.completed_at:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+startup = StartupTimeline()
+
+
+class StatusServer:
+    """Local HTTP endpoint for metrics and supervisor probes.
+
+    ``/metrics`` serves Prometheus text. ``/ready`` answers 200 once
+    ``ready()`` holds and 503 before that; ``/healthz`` answers 200 while
+    ``alive()`` holds, and not at all if the event loop is stuck. Both carry
+    the startup timeline as JSON.
+    """
+
+    def __init__(self, host: str, port: int, ready=lambda: True, alive=lambda: True):
+        self.host = host
+        self.port = port
+        self.ready = ready
+        self.alive = alive
+        self.runner: web.AppRunner | None = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/ready", self.handle_ready)
+        app.router.add_get("/healthz", self.handle_healthz)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=metrics.render_prometheus() + startup.render_prometheus(),
+            content_type="text/plain",
+            charset="utf-8",
+        )
+
+    @staticmethod
+    def probe(ok: bool) -> web.Response:
+        return web.json_response(
+            {"ok": ok, **startup.report()}, status=200 if ok else 503
+        )
+
+    async def handle_ready(self, request: web.Request) -> web.Response:
+        return self.probe(self.ready())
+
+    async def handle_healthz(self, request: web.Request) -> web.Response:
+        return self.probe(self.alive())
+
+
+# ================== INTERACTION DISPATCH ==================
+
+
+async def respond(
+    interaction: discord.Interaction, content: str | None = None, **kwargs
+):
+    """Reply to an interaction whether or not it has already been deferred."""
+    if content is not None:
+        kwargs["content"] = content
+    if interaction.response.is_done():
+        await interaction.followup.send(**kwargs)
+    else:
+        await interaction.response.send_message(**kwargs)
+
+
+def deferred(func):
+    """Acknowledge the interaction before running the command body.
+
+    The ephemeral defer goes out first so channel sends, fetches and store
+    reads never count against the 3-second acknowledgement window; the body
+    then replies through ``respond``, which uses followups once deferred.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+        invocation = Invocation(func.__name__)
+        token = current_invocation.set(invocation)
+        failed = False
+        ack = None  # stays None if the defer itself fails
+        try:
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            ack = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+            await func(interaction, *args, **kwargs)
+        except Exception:
+            failed = True
+            if ack is not None:
+                await respond(
+                    interaction,
+                    "Something went wrong while running this command.",
+                    ephemeral=True,
+                )
+            raise
+        finally:
+            total = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+            metrics.record_invocation(invocation, ack, total, failed)
+            current_invocation.reset(token)
+
+    return wrapper
+
+
+# ================== OUTBOUND QUEUE ==================
+
+PRIORITY_HIGH = 0  # announcements, warrant decisions
+PRIORITY_NORMAL = 1  # log posts and reports
+PRIORITY_LOW = 2  # cosmetic edits such as attendee counters
+
+
+class OutboundJob:
+    def __init__(self, call, kwargs: dict, priority: int, message_id: int | None):
+        self.call = call
+        self.kwargs = kwargs
+        self.priority = priority
+        self.message_id = message_id  # set for edits, which may be coalesced
+        self.invocation = current_invocation.get()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.started = False
+
+
+class OutboundQueue:
+    """Priority queue in front of every channel send and message edit.
+
+    Discord rate-limits message creates and edits per channel, so each
+    channel has its own heap, drained by at most
+    ``OUTBOUND_CHANNEL_CONCURRENCY`` workers, highest priority first. A
+    rate-limited channel only holds up its own queue, and an announcement
+    never waits behind a backlog of counter edits.
+
+    An edit to a message that already has one waiting is merged into it
+    (later fields win) instead of being queued again, and edits to the same
+    message never run concurrently, so they land in order.
+    """
+
+    def __init__(self):
+        self.queues: dict[int, list] = {}
+        self.workers: dict[int, int] = defaultdict(int)
+        self.pending_edits: dict[int, OutboundJob] = {}
+        self.editing: set[int] = set()
+        self.tasks: set[asyncio.Task] = set()
+        self.sequence = itertools.count()
+
+    async def send(
+        self,
+        channel: discord.abc.Messageable,
+        priority: int = PRIORITY_NORMAL,
+        **kwargs,
+    ) -> discord.Message:
+        job = OutboundJob(channel.send, kwargs, priority, None)
+        self._push(channel.id, job)
+        return await asyncio.shield(job.future)
+
+    async def edit(
+        self, message: discord.Message, priority: int = PRIORITY_LOW, **kwargs
+    ) -> discord.Message:
+        job = self.pending_edits.get(message.id)
+        if job is None:
+            job = OutboundJob(message.edit, kwargs, priority, message.id)
+            self.pending_edits[message.id] = job
+            self._push(message.channel.id, job)
+        else:
+            job.kwargs.update(kwargs)
+            if priority < job.priority:
+                # The old heap entry is skipped once this one has run.
+                job.priority = priority
+                self._push(message.channel.id, job)
+        return await asyncio.shield(job.future)
+
+    def _push(self, channel_id: int, job: OutboundJob):
+        queue = self.queues.setdefault(channel_id, [])
+        heapq.heappush(queue, (job.priority, next(self.sequence), job))
+        if self.workers[channel_id] < OUTBOUND_CHANNEL_CONCURRENCY:
+            self.workers[channel_id] += 1
+            task = asyncio.create_task(self._work(channel_id))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    def _next_job(self, queue: list) -> OutboundJob | None:
+        held = []
+        job = None
+        while queue:
+            entry = heapq.heappop(queue)
+            candidate = entry[2]
+            if candidate.started:
+                continue
+            if candidate.message_id in self.editing:
+                held.append(entry)
+                continue
+            job = candidate
+            break
+        for entry in held:
+            heapq.heappush(queue, entry)
+        return job
+
+    async def _work(self, channel_id: int):
+        queue = self.queues[channel_id]
+        try:
+            while (job := self._next_job(queue)) is not None:
+                await self._run(job)
+        finally:
+            self.workers[channel_id] -= 1
+            if not self.workers[channel_id]:
+                del self.workers[channel_id]
+                if not queue:
+                    del self.queues[channel_id]
+
+    async def _run(self, job: OutboundJob):
+        job.started = True
+        if job.message_id is not None:
+            self.pending_edits.pop(job.message_id, None)
+            self.editing.add(job.message_id)
+        # REST calls are attributed to the command that queued the job.
+        token = current_invocation.set(job.invocation)
+        try:
+            result = await job.call(**job.kwargs)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as exc:
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(result)
+        finally:
+            current_invocation.reset(token)
+            self.editing.discard(job.message_id)
+
+    async def drain(self):
+        """Wait until everything queued so far has been sent."""
+        while self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+outbound = OutboundQueue()
+
+
+# ================== EMBED TEMPLATES ==================
+
+
+def fill_template(value, params: dict):
+    """Copy a template payload, formatting only strings with placeholders."""
+    if isinstance(value, str):
+        return value.format_map(params) if "{" in value else value
+    if isinstance(value, dict):
+        return {key: fill_template(item, params) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill_template(item, params) for item in value]
+    return value
+
+
+def is_signed_cdn_url(url: str) -> bool:
+    """Discord attachment links carry an ``ex=`` expiry and stop working."""
+    host = url.split("://", 1)[-1].split("/", 1)[0]
+    return host in ("cdn.discordapp.com", "media.discordapp.net") and "ex=" in url
+
+
+class EmbedTemplates:
+    """Embed payloads read once from ``templates.json``.
+
+    Templates are kept as the payload dicts Discord expects; each call fills
+    in its ``{placeholder}`` strings and builds the embed from the copy. A
+    template's ``image_file`` is sent attached and shown via
+    ``attachment://``, so the image does not depend on a signed CDN link that
+    expires. A missing ``image_file``, or a signed Discord CDN link as an
+    image URL, fails the load rather than posting a link that goes dead.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.payloads: dict[str, dict] | None = None
+        self.images: dict[str, tuple[str, bytes]] = {}
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as fp:
+            data = json.load(fp)
+
+        payloads = {}
+        images = {}
+        base = os.path.dirname(self.path)
+        for name, template in data.items():
+            payload = template["embed"]
+            image_file = template.get("image_file")
+            if image_file:
+                image_path = os.path.join(base, image_file)
+                try:
+                    with open(image_path, "rb") as fp:
+                        image = fp.read()
+                except FileNotFoundError:
+                    raise ValueError(
+                        f"template {name!r}: image_file {image_path} not found"
+                    ) from None
+                filename = os.path.basename(image_path)
+                images[name] = (filename, image)
+                payload = {**payload, "image": {"url": f"attachment://{filename}"}}
+            elif is_signed_cdn_url(payload.get("image", {}).get("url", "")):
+                raise ValueError(
+                    f"template {name!r}: signed Discord CDN image links expire; "
+                    "use image_file instead"
+                )
+            payloads[name] = payload
+
+        self.payloads = payloads
+        self.images = images
+
+    def embed(self, name: str, **params) -> discord.Embed:
+        if self.payloads is None:
+            self.load()
+        return discord.Embed.from_dict(fill_template(self.payloads[name], params))
+
+    def message(self, name: str, **params) -> dict:
+        """Keyword arguments for ``send``: the embed plus its image, if any."""
+        kwargs = {"embed": self.embed(name, **params)}
+        image = self.images.get(name)
+        if image is not None:
+            filename, data = image
+            kwargs["file"] = discord.File(io.BytesIO(data), filename=filename)
+        return kwargs
+
+
+_templates: dict[str, EmbedTemplates] = {}
+
+
+def templates_path(config: BotConfig) -> str:
+    if config.templates_path:
+        return os.path.join(os.path.dirname(CONFIG_PATH), config.templates_path)
+    return TEMPLATES_PATH
+
+
+def templates_for(config: BotConfig) -> EmbedTemplates:
+    """The (shared, cached) templates named by a guild's config."""
+    path = templates_path(config)
+    templates = _templates.get(path)
+    if templates is None:
+        templates = _templates[path] = EmbedTemplates(path)
+    return templates
+
+
+def preload_templates(old: GuildConfigs, new: GuildConfigs):
+    """Config validator: load the template files ``new`` points at anew.
+
+    Runs before a reloaded config is swapped in, so a missing or invalid
+    file rejects the reload instead of breaking every templated command.
+    """
+    known = {templates_path(config) for config in old.all()}
+    for path in {templates_path(config) for config in new.all()} - known:
+        templates = EmbedTemplates(path)
+        templates.load()
+        _templates[path] = templates
+
+
+# ================== PAGINATION ==================
+
+# Discord rejects message content over 2000 characters.
+PAGE_CHAR_LIMIT = 1900
+PAGINATOR_TIMEOUT = 300
+
+
+async def _as_async_iterator(entries):
+    if hasattr(entries, "__aiter__"):
+        async for entry in entries:
+            yield entry
+    else:
+        for entry in entries:
+            yield entry
+
+
+class PaginatorView(discord.ui.View):
+    """Prev/next pages over a lazily consumed iterator of text entries.
+
+    Entries are pulled from the (sync or async) iterator only when the page
+    that needs them is rendered, so a huge result never has to be collected
+    up front. Rendered pages are kept for the Prev button.
+    """
+
+    def __init__(
+        self,
+        entries,
+        header: str,
+        invoker_id: int,
+        separator: str = "\n",
+    ):
+        super().__init__(timeout=PAGINATOR_TIMEOUT)
+        self.entries = _as_async_iterator(entries)
+        self.header = header
+        self.invoker_id = invoker_id
+        self.separator = separator
+        self.pages: list[str] = []
+        self.index = 0
+        self.lookahead: str | None = None
+        self.exhausted = False
+
+    async def _next_entry(self) -> str | None:
+        if self.lookahead is not None:
+            entry, self.lookahead = self.lookahead, None
+            return entry
+        if self.exhausted:
+            return None
+        try:
+            return await anext(self.entries)
+        except StopAsyncIteration:
+            self.exhausted = True
+            return None
+
+    async def _has_more(self) -> bool:
+        if self.lookahead is None:
+            self.lookahead = await self._next_entry()
+        return self.lookahead is not None
+
+    async def _build_page(self) -> bool:
+        # Leave room for the header and the "Page x of y" footer.
+        limit = PAGE_CHAR_LIMIT - len(self.header) - 32
+        body: list[str] = []
+        size = 0
+        while True:
+            entry = await self._next_entry()
+            if entry is None:
+                break
+            entry = entry[:limit]
+            if body and size + len(self.separator) + len(entry) > limit:
+                self.lookahead = entry
+                break
+            body.append(entry)
+            size += len(self.separator) + len(entry)
+        if not body:
+            return False
+        self.pages.append(self.separator.join(body))
+        return True
+
+    async def _render(self) -> str:
+        has_next = self.index + 1 < len(self.pages) or await self._has_more()
+        self.prev_button.disabled = self.index == 0
+        self.next_button.disabled = not has_next
+        page = f"Page {self.index + 1}"
+        if not has_next and self.exhausted:
+            page += f" of {len(self.pages)}"
+        return f"{self.header}\n\n{self.pages[self.index]}\n\n{page}"
+
+    async def first_page(self) -> str | None:
+        """Render page one, or return None if there are no entries at all."""
+        if not self.pages and not await self._build_page():
+            return None
+        return await self._render()
+
+    @property
+    def single_page(self) -> bool:
+        return len(self.pages) == 1 and self.lookahead is None and self.exhausted
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.invoker_id:
+            await interaction.response.send_message(
+                "You are not allowed to interact with these results.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.secondary)
+    async def prev_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        self.index = max(0, self.index - 1)
+        content = await self._render()
+        await interaction.response.edit_message(content=content, view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        if self.index + 1 < len(self.pages) or await self._build_page():
+            self.index += 1
+        content = await self._render()
+        await interaction.response.edit_message(content=content, view=self)
+
+
+async def respond_paginated(
+    interaction: discord.Interaction,
+    entries,
+    header: str,
+    empty_message: str,
+    separator: str = "\n",
+):
+    """Send the first page of ``entries``, with buttons only if there are more."""
+    view = PaginatorView(entries, header, interaction.user.id, separator)
+    content = await view.first_page()
+    if content is None:
+        await respond(interaction, empty_message, ephemeral=True)
+        return
+    if view.single_page:
+        await respond(interaction, content, ephemeral=True)
+        return
+    await respond(interaction, content, view=view, ephemeral=True)
+
+
+# ================== USERNAME AUTOCOMPLETE ==================
+
+AUTOCOMPLETE_LIMIT = 25  # Discord shows at most 25 choices
+
+
+class UsernameTrie:
+    """Prefix trie over every known Roblox username, for autocomplete.
+
+    Nodes are plain dicts keyed by character; the ``None`` key marks the end
+    of a username and holds its display form. Exact prefix matches come
+    first; if there are too few, usernames whose prefix is one edit (extra,
+    missing, wrong or swapped character) away from what was typed are added.
+    """
+
+    def __init__(self):
+        self.root: dict = {}
+        self.size = 0
+
+    def add(self, username: str):
+        node = self.root
+        for char in normalize_username(username):
+            node = node.setdefault(char, {})
+        if None not in node:
+            self.size += 1
+        node[None] = username
+
+    def load(self, usernames):
+        for username in usernames:
+            self.add(username)
+
+    def _collect(self, node: dict, found: dict[str, None], limit: int):
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            if None in node:
+                found.setdefault(node[None])
+            children = sorted((char for char in node if char is not None), reverse=True)
+            stack.extend(node[char] for char in children)
+
+    def suggest(self, text: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        query = normalize_username(text)
+        found: dict[str, None] = {}
+
+        node = self.root
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            self._collect(node, found, limit)
+
+        if len(found) < limit and len(query) >= 3:
+            self._one_edit(query, found, limit)
+
+        return list(found)[:limit]
+
+    @staticmethod
+    def _walk(node: dict | None, text: str) -> dict | None:
+        for char in text:
+            if node is None:
+                return None
+            node = node.get(char)
+        return node
+
+    def _one_edit(self, query: str, found: dict[str, None], limit: int):
+        """Collect usernames whose prefix is one edit away from ``query``.
+
+        Rather than running an edit-distance table per trie node, each kind
+        of single typo is undone directly: at every position the walk tries
+        skipping the typed character (extra key), swapping it with the next
+        one, and branching into each existing child (missed or wrong key).
+        Only characters that exist in the trie are ever tried.
+        """
+        node = self.root
+        for index in range(len(query) + 1):
+            rest = query[index:]
+            candidates = []
+            if rest:
+                candidates.append(self._walk(node, rest[1:]))
+            if len(rest) >= 2 and rest[0] != rest[1]:
+                candidates.append(self._walk(node, rest[1] + rest[0] + rest[2:]))
+            for char, child in node.items():
+                if char is None:
+                    continue
+                candidates.append(self._walk(child, rest))
+                if rest and char != rest[0]:
+                    candidates.append(self._walk(child, rest[1:]))
+
+            for candidate in candidates:
+                if candidate is not None:
+                    self._collect(candidate, found, limit)
+                    if len(found) >= limit:
+                        return
+
+            if not rest:
+                return
+            node = node.get(rest[0])
+            if node is None:
+                return
+
+
+async def username_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    if interaction.guild is None or not guild_states.serves(interaction.guild):
+        return []
+    usernames = state_for(interaction.guild_id).usernames
+    return [
+        app_commands.Choice(name=username, value=username)
+        for username in usernames.suggest(current)
+    ]
+
+
+# ================== CASE STORE ==================
+
+
+def normalize_username(username: str) -> str:
+    return username.strip().casefold()
+
+
+SQLITE_MAX_INTEGER = (1 << 63) - 1
+
+
+def parse_id(text: str) -> int | None:
+    """A case, warrant or message ID typed by a user, or None if it isn't one.
+
+    Only ASCII digits count (``"²".isdigit()`` is true, but ``int`` rejects
+    it), and the value must fit an SQLite integer.
+    """
+    text = text.strip()
+    if not text.isascii() or not text.isdigit():
+        return None
+    value = int(text)
+    return value if 0 < value <= SQLITE_MAX_INTEGER else None
+
+StatsPeriod = Literal["day", "week", "month"]
+STATS_PERIODS: tuple[StatsPeriod, ...] = ("day", "week", "month")
+
+
+def period_start(timestamp: float, period: StatsPeriod) -> int:
+    """Start of the UTC day, ISO week or month containing ``timestamp``."""
+    start = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "week":
+        start -= datetime.timedelta(days=start.weekday())
+    elif period == "month":
+        start = start.replace(day=1)
+    return int(start.timestamp())
+
+
+class CaseStore:
+    """Local SQLite index of moderation cases.
+
+    Lookups by Roblox username hit ``idx_mod_cases_username`` instead of
+    paging through the log channel history.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS mod_cases (
+            message_id      INTEGER PRIMARY KEY,
+            roblox_username TEXT NOT NULL,
+            username_key    TEXT NOT NULL,
+            mod_type        TEXT NOT NULL,
+            reason          TEXT NOT NULL,
+            moderator       TEXT NOT NULL,
+            jump_url        TEXT NOT NULL,
+            created_at      REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_mod_cases_username
+            ON mod_cases (username_key, message_id);
+        CREATE TABLE IF NOT EXISTS sync_state (
+            channel_id      INTEGER PRIMARY KEY,
+            last_message_id INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS case_counters (
+            kind  TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS case_messages (
+            kind       TEXT NOT NULL,
+            case_id    INTEGER NOT NULL,
+            message_id INTEGER NOT NULL,
+            PRIMARY KEY (kind, case_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_case_messages_message
+            ON case_messages (kind, message_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS warrants (
+            warrant_id       INTEGER PRIMARY KEY,
+            message_id       INTEGER NOT NULL UNIQUE,
+            suspect_username TEXT NOT NULL,
+            suspect_key      TEXT NOT NULL,
+            requester_id     INTEGER NOT NULL,
+            requester        TEXT NOT NULL,
+            charges          TEXT NOT NULL,
+            state            TEXT NOT NULL DEFAULT 'pending'
+                CHECK (state IN ('pending', 'approved', 'denied')),
+            decided_by_id    INTEGER,
+            decided_by       TEXT,
+            decided_at       REAL,
+            created_at       REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_warrants_suspect
+            ON warrants (suspect_key, warrant_id);
+        CREATE INDEX IF NOT EXISTS idx_warrants_requester
+            ON warrants (requester_id, warrant_id);
+        CREATE INDEX IF NOT EXISTS idx_warrants_state
+            ON warrants (state, warrant_id);
+        CREATE TABLE IF NOT EXISTS records (
+            kind         TEXT NOT NULL,
+            message_id   INTEGER NOT NULL,
+            record_id    INTEGER NOT NULL,
+            username     TEXT NOT NULL,
+            username_key TEXT NOT NULL,
+            summary      TEXT NOT NULL,
+            jump_url     TEXT NOT NULL,
+            created_at   REAL NOT NULL,
+            PRIMARY KEY (kind, message_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_records_username
+            ON records (username_key, created_at);
+        CREATE TABLE IF NOT EXISTS citations (
+            citation_id      INTEGER PRIMARY KEY,
+            message_id       INTEGER NOT NULL UNIQUE,
+            suspect_username TEXT NOT NULL,
+            suspect_key      TEXT NOT NULL,
+            officer_id       INTEGER NOT NULL,
+            fine             INTEGER NOT NULL,
+            created_at       REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fine_totals (
+            suspect_key      TEXT PRIMARY KEY,
+            suspect_username TEXT NOT NULL,
+            citations        INTEGER NOT NULL,
+            total_fine       INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fine_totals_total
+            ON fine_totals (total_fine DESC);
+        CREATE TABLE IF NOT EXISTS fine_periods (
+            period       TEXT NOT NULL,
+            period_start INTEGER NOT NULL,
+            citations    INTEGER NOT NULL,
+            total_fine   INTEGER NOT NULL,
+            PRIMARY KEY (period, period_start)
+        );
+        CREATE TABLE IF NOT EXISTS record_charges (
+            kind       TEXT NOT NULL,
+            record_id  INTEGER NOT NULL,
+            message_id INTEGER NOT NULL,
+            charge     TEXT NOT NULL,
+            count      INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (kind, record_id, charge)
+        );
+        CREATE INDEX IF NOT EXISTS idx_record_charges_charge
+            ON record_charges (kind, charge, created_at);
+        CREATE TABLE IF NOT EXISTS charge_counts (
+            kind         TEXT NOT NULL,
+            period       TEXT NOT NULL,
+            period_start INTEGER NOT NULL,
+            charge       TEXT NOT NULL,
+            total        INTEGER NOT NULL,
+            PRIMARY KEY (kind, period, period_start, charge)
+        );
+        CREATE INDEX IF NOT EXISTS idx_charge_counts_total
+            ON charge_counts (kind, period, period_start, total DESC);
+        CREATE TABLE IF NOT EXISTS ssu_votes (
+            message_id   INTEGER PRIMARY KEY,
+            channel_id   INTEGER NOT NULL,
+            session_time TEXT NOT NULL,
+            created_at   REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS ssu_attendees (
+            message_id INTEGER NOT NULL,
+            user_id    INTEGER NOT NULL,
+            PRIMARY KEY (message_id, user_id)
+        );
+        CREATE TABLE IF NOT EXISTS ssu_sessions (
+            vote_message_id INTEGER PRIMARY KEY,
+            started_at      REAL NOT NULL,
+            reported        INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn: sqlite3.Connection | None = None
+
+    def open(self):
+        if self.conn is not None:
+            return
+        # Opened in a worker thread at startup, then only used on the loop.
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        if self.get_meta("records_indexed") is None:
+            with self.conn:
+                self._reindex_mod_cases()
+                self._reindex_warrants()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('records_indexed', '1')"
+                )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def add_case(
+        self,
+        message_id: int,
+        roblox_username: str,
+        mod_type: str,
+        reason: str,
+        moderator: str,
+        jump_url: str,
+        created_at: float | None = None,
+    ):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO mod_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    message_id,
+                    roblox_username,
+                    normalize_username(roblox_username),
+                    mod_type,
+                    reason,
+                    moderator,
+                    jump_url,
+                    created_at if created_at is not None else time.time(),
+                ),
+            )
+            self._reindex_mod_cases([message_id])
+
+    def add_cases_batch(
+        self,
+        cases: list[tuple],
+        case_ids: list[tuple[int, int]],
+        channel_id: int,
+        last_message_id: int,
+    ):
+        """Insert parsed cases and advance the channel checkpoint atomically."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO mod_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                cases,
+            )
+            for case_id, message_id in case_ids:
+                self._link_case("moderation", case_id, message_id)
+            self._reindex_mod_cases([case[0] for case in cases])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                (channel_id, last_message_id),
+            )
+
+    def get_checkpoint(self, channel_id: int) -> int | None:
+        row = self.conn.execute(
+            "SELECT last_message_id FROM sync_state WHERE channel_id = ?",
+            (channel_id,),
+        ).fetchone()
+        return row["last_message_id"] if row else None
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value)
+            )
+
+    def allocate_case_id(self, kind: str) -> int:
+        """Reserve the next sequential case number for ``kind``.
+
+        The number is known before the log embed is sent, so the footer can be
+        filled in on the first request instead of a send followed by an edit.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO case_counters VALUES (?, 1) "
+                "ON CONFLICT (kind) DO UPDATE SET value = value + 1",
+                (kind,),
+            )
+            row = self.conn.execute(
+                "SELECT value FROM case_counters WHERE kind = ?", (kind,)
+            ).fetchone()
+        return row["value"]
+
+    def _link_case(self, kind: str, case_id: int, message_id: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO case_messages VALUES (?, ?, ?)",
+            (kind, case_id, message_id),
+        )
+        # Keep the counter ahead of any case number recovered from a backfill.
+        self.conn.execute(
+            "INSERT INTO case_counters VALUES (?, ?) "
+            "ON CONFLICT (kind) DO UPDATE SET value = MAX(value, excluded.value)",
+            (kind, case_id),
+        )
+
+    def link_case(self, kind: str, case_id: int, message_id: int):
+        with self.conn:
+            self._link_case(kind, case_id, message_id)
+
+    def resolve_message_id(self, kind: str, case_or_message_id: int) -> int:
+        """Map a case number to its log message ID.
+
+        Legacy logs used the message ID itself as the case ID, so anything not
+        found in ``case_messages`` is passed through unchanged.
+        """
+        row = self.conn.execute(
+            "SELECT message_id FROM case_messages WHERE kind = ? AND case_id = ?",
+            (kind, case_or_message_id),
+        ).fetchone()
+        return row["message_id"] if row else case_or_message_id
+
+    def update_case(self, message_id: int, mod_type: str, reason: str):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE mod_cases SET mod_type = ?, reason = ? WHERE message_id = ?",
+                (mod_type, reason, message_id),
+            )
+            self._reindex_mod_cases([message_id])
+
+    def delete_case(self, message_id: int):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM mod_cases WHERE message_id = ?", (message_id,)
+            )
+            self.delete_record("moderation", message_id)
+
+    # ---- unified record index ----
+    #
+    # ``records`` holds one row per moderation case, citation, arrest and
+    # warrant, keyed by normalized username, so /record builds a user's whole
+    # timeline from one indexed query. Moderation cases and warrants are
+    # re-derived from their own tables whenever those change; citations and
+    # arrests are indexed directly when they are logged.
+
+    @staticmethod
+    def _message_filter(column: str, message_ids: list[int] | None) -> str:
+        if message_ids is None:
+            return ""
+        return f" WHERE {column} IN ({', '.join('?' * len(message_ids))})"
+
+    def _reindex_mod_cases(self, message_ids: list[int] | None = None):
+        if message_ids == []:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records "
+            "SELECT 'moderation', mc.message_id, "
+            "COALESCE(cm.case_id, mc.message_id), mc.roblox_username, "
+            "mc.username_key, mc.mod_type || ' - ' || mc.reason || "
+            "' (by ' || mc.moderator || ')', mc.jump_url, mc.created_at "
+            "FROM mod_cases mc LEFT JOIN case_messages cm "
+            "ON cm.kind = 'moderation' AND cm.message_id = mc.message_id"
+            + self._message_filter("mc.message_id", message_ids),
+            message_ids or (),
+        )
+
+    def _reindex_warrants(self, message_ids: list[int] | None = None):
+        if message_ids == []:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records "
+            "SELECT 'warrant', message_id, warrant_id, suspect_username, "
+            "suspect_key, upper(substr(state, 1, 1)) || substr(state, 2) || "
+            "' - ' || charges || ' (requested by ' || requester || ')', "
+            "'', created_at FROM warrants"
+            + self._message_filter("message_id", message_ids),
+            message_ids or (),
+        )
+
+    def index_record(
+        self,
+        kind: str,
+        message_id: int,
+        record_id: int,
+        username: str,
+        summary: str,
+        jump_url: str,
+    ):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    message_id,
+                    record_id,
+                    username,
+                    normalize_username(username),
+                    summary,
+                    jump_url,
+                    time.time(),
+                ),
+            )
+
+    def delete_record(self, kind: str, message_id: int):
+        self.conn.execute(
+            "DELETE FROM records WHERE kind = ? AND message_id = ?",
+            (kind, message_id),
+        )
+
+    def known_usernames(self):
+        rows = self.conn.execute(
+            "SELECT username FROM records GROUP BY username_key"
+        )
+        return (row["username"] for row in rows)
+
+    def records_for_user(self, username: str) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM records WHERE username_key = ? ORDER BY created_at DESC",
+            (normalize_username(username),),
+        ).fetchall()
+
+    def add_warrant(
+        self,
+        warrant_id: int,
+        message_id: int,
+        suspect_username: str,
+        requester_id: int,
+        requester: str,
+        charges: str,
+    ):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO warrants (warrant_id, message_id, suspect_username, "
+                "suspect_key, requester_id, requester, charges, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    warrant_id,
+                    message_id,
+                    suspect_username,
+                    normalize_username(suspect_username),
+                    requester_id,
+                    requester,
+                    charges,
+                    time.time(),
+                ),
+            )
+            self._reindex_warrants([message_id])
+
+    def get_warrant(self, warrant_id: int) -> sqlite3.Row | None:
+        return self.conn.execute(
+            "SELECT * FROM warrants WHERE warrant_id = ? OR message_id = ?",
+            (warrant_id, warrant_id),
+        ).fetchone()
+
+    def get_warrant_by_message(self, message_id: int) -> sqlite3.Row | None:
+        return self.conn.execute(
+            "SELECT * FROM warrants WHERE message_id = ?", (message_id,)
+        ).fetchone()
+
+    def decide_warrant(
+        self, message_id: int, state: str, decided_by_id: int, decided_by: str
+    ) -> tuple[bool, sqlite3.Row | None]:
+        """Compare-and-set a pending warrant to ``approved``/``denied``.
+
+        Returns whether this call made the decision, and the current record
+        (None for warrants that are not in the store).
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE warrants SET state = ?, decided_by_id = ?, decided_by = ?, "
+                "decided_at = ? WHERE message_id = ? AND state = 'pending'",
+                (state, decided_by_id, decided_by, time.time(), message_id),
+            )
+            if cursor.rowcount == 1:
+                self._reindex_warrants([message_id])
+        return cursor.rowcount == 1, self.get_warrant_by_message(message_id)
+
+    def warrants_for_suspect(self, suspect_username: str) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM warrants WHERE suspect_key = ? ORDER BY warrant_id DESC",
+            (normalize_username(suspect_username),),
+        ).fetchall()
+
+    def warrants_by_requester(self, requester_id: int) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM warrants WHERE requester_id = ? ORDER BY warrant_id DESC",
+            (requester_id,),
+        ).fetchall()
+
+    def pending_warrants(self) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM warrants WHERE state = 'pending' ORDER BY warrant_id"
+        ).fetchall()
+
+    # ---- citation fines ----
+    #
+    # ``fine_totals`` (per suspect) and ``fine_periods`` (per day, week and
+    # month) are bumped in the same transaction as each citation insert, so
+    # /citation_stats reads a handful of pre-summed rows however many
+    # citations exist.
+
+    def add_citation(
+        self,
+        citation_id: int,
+        message_id: int,
+        suspect_username: str,
+        officer_id: int,
+        fine: int,
+    ):
+        created_at = time.time()
+        suspect_key = normalize_username(suspect_username)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO citations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    citation_id,
+                    message_id,
+                    suspect_username,
+                    suspect_key,
+                    officer_id,
+                    fine,
+                    created_at,
+                ),
+            )
+            self.conn.execute(
+                "INSERT INTO fine_totals VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (suspect_key) DO UPDATE SET "
+                "suspect_username = excluded.suspect_username, "
+                "citations = citations + 1, "
+                "total_fine = total_fine + excluded.total_fine",
+                (suspect_key, suspect_username, fine),
+            )
+            self.conn.executemany(
+                "INSERT INTO fine_periods VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (period, period_start) DO UPDATE SET "
+                "citations = citations + 1, "
+                "total_fine = total_fine + excluded.total_fine",
+                [
+                    (period, period_start(created_at, period), fine)
+                    for period in STATS_PERIODS
+                ],
+            )
+
+    def fine_total_for(self, suspect_username: str) -> sqlite3.Row | None:
+        return self.conn.execute(
+            "SELECT * FROM fine_totals WHERE suspect_key = ?",
+            (normalize_username(suspect_username),),
+        ).fetchone()
+
+    def top_fined(self, limit: int = 10) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM fine_totals ORDER BY total_fine DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def fines_by_period(self, period: StatsPeriod, limit: int = 8) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM fine_periods WHERE period = ? "
+            "ORDER BY period_start DESC LIMIT ?",
+            (period, limit),
+        ).fetchall()
+
+    # ---- charges ----
+    #
+    # Parsed arrest and warrant charges go into ``record_charges`` (for "every
+    # arrest with charge X") and are summed into ``charge_counts`` per day,
+    # week and month (for "most common charges this week") in one transaction.
+
+    def add_charges(
+        self,
+        kind: str,
+        record_id: int,
+        message_id: int,
+        charges: list[tuple[int, str]],
+    ):
+        created_at = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO record_charges VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (kind, record_id, message_id, charge, count, created_at)
+                    for count, charge in charges
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO charge_counts VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, period, period_start, charge) DO UPDATE SET "
+                "total = total + excluded.total",
+                [
+                    (kind, period, period_start(created_at, period), charge, count)
+                    for period in STATS_PERIODS
+                    for count, charge in charges
+                ],
+            )
+
+    def top_charges(
+        self, kind: str, period: StatsPeriod, limit: int = 10
+    ) -> list[sqlite3.Row]:
+        """Most frequent charges of ``kind`` in the current ``period``."""
+        return self.conn.execute(
+            "SELECT charge, total FROM charge_counts "
+            "WHERE kind = ? AND period = ? AND period_start = ? "
+            "ORDER BY total DESC LIMIT ?",
+            (kind, period, period_start(time.time(), period), limit),
+        ).fetchall()
+
+    def records_with_charge(self, kind: str, charge: str) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT records.* FROM record_charges JOIN records "
+            "ON records.kind = record_charges.kind "
+            "AND records.message_id = record_charges.message_id "
+            "WHERE record_charges.kind = ? AND record_charges.charge = ? "
+            "ORDER BY record_charges.created_at DESC",
+            (kind, charge),
+        ).fetchall()
+
+    def add_vote(self, message_id: int, channel_id: int, session_time: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ssu_votes VALUES (?, ?, ?, ?)",
+                (message_id, channel_id, session_time, time.time()),
+            )
+
+    def vote_attendees(self, message_id: int) -> set[int]:
+        rows = self.conn.execute(
+            "SELECT user_id FROM ssu_attendees WHERE message_id = ?", (message_id,)
+        )
+        return {row["user_id"] for row in rows}
+
+    def apply_vote_changes(self, changes: list[tuple[int, int, bool]]):
+        """Write a batch of ``(message_id, user_id, attending)`` toggles."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO ssu_attendees VALUES (?, ?)",
+                [(m, u) for m, u, attending in changes if attending],
+            )
+            self.conn.executemany(
+                "DELETE FROM ssu_attendees WHERE message_id = ? AND user_id = ?",
+                [(m, u) for m, u, attending in changes if not attending],
+            )
+
+    def latest_vote(self) -> sqlite3.Row | None:
+        return self.conn.execute(
+            "SELECT * FROM ssu_votes ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+
+    def start_session(self, voted_since: float) -> int | None:
+        """Start a session from the latest vote, if it is recent and unused.
+
+        Returns the vote's message ID, or None when the latest vote is older
+        than ``voted_since`` or already started a session, so a repeated
+        /ssu neither re-arms a reported session nor revives an old vote.
+        """
+        vote = self.latest_vote()
+        if vote is None or vote["created_at"] < voted_since:
+            return None
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO ssu_sessions VALUES (?, ?, 0)",
+                (vote["message_id"], time.time()),
+            )
+        return vote["message_id"] if cursor.rowcount else None
+
+    def get_session(self, vote_message_id: int | None = None) -> sqlite3.Row | None:
+        """The session started from ``vote_message_id``, or the latest one."""
+        if vote_message_id is None:
+            return self.conn.execute(
+                "SELECT * FROM ssu_sessions ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+        return self.conn.execute(
+            "SELECT * FROM ssu_sessions WHERE vote_message_id = ?",
+            (vote_message_id,),
+        ).fetchone()
+
+    def due_sessions(self, started_before: float) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM ssu_sessions WHERE reported = 0 AND started_at <= ?",
+            (started_before,),
+        ).fetchall()
+
+    def mark_session_reported(self, vote_message_id: int):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE ssu_sessions SET reported = 1 WHERE vote_message_id = ?",
+                (vote_message_id,),
+            )
+
+    def cases_for_user(self, roblox_username: str) -> list[sqlite3.Row]:
+        return list(self.iter_cases_for_user(roblox_username))
+
+    def iter_cases_for_user(self, roblox_username: str, batch_size: int = 50):
+        """Yield a user's cases newest first, fetching ``batch_size`` at a time.
+
+        Each batch is a keyset query below the last message ID seen, so no
+        cursor stays open between pages.
+        """
+        username_key = normalize_username(roblox_username)
+        before = SQLITE_MAX_INTEGER
+        while True:
+            rows = self.conn.execute(
+                "SELECT mod_cases.*, case_messages.case_id FROM mod_cases "
+                "LEFT JOIN case_messages ON case_messages.kind = 'moderation' "
+                "AND case_messages.message_id = mod_cases.message_id "
+                "WHERE username_key = ? AND mod_cases.message_id < ? "
+                "ORDER BY mod_cases.message_id DESC LIMIT ?",
+                (username_key, before, batch_size),
+            ).fetchall()
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            before = rows[-1]["message_id"]
+
+
+# ================== GUILD STATE ==================
+
+
+class GuildState:
+    """Everything kept per guild namespace: store, indexes and session state.
+
+    Guilds with their own entry under ``guilds`` in config.json each get a
+    namespace (and database file) of their own; every other guild shares the
+    default namespace. Nothing here is shared between namespaces, so a busy
+    guild's vote flushes and store writes never queue behind another's.
+    """
+
+    def __init__(self, namespace: int | None, db_path: str):
+        self.namespace = namespace
+        self.store = CaseStore(db_path)
+        self.usernames = UsernameTrie()
+        self.votes = VoteTracker(self.store)
+        self.voice = VoicePresence(namespace)
+        self.tasks: list[asyncio.Task] = []
+
+    @property
+    def config(self) -> BotConfig:
+        return config_for(self.namespace)
+
+    @property
+    def templates(self) -> EmbedTemplates:
+        return templates_for(self.config)
+
+    def open(self):
+        self.store.open()
+        self.usernames.load(self.store.known_usernames())
+
+    def start(self):
+        self.tasks = [
+            asyncio.create_task(self.votes.run()),
+            asyncio.create_task(self.votes.run_counters()),
+        ]
+
+    def close(self):
+        for task in self.tasks:
+            task.cancel()
+        self.votes.flush()
+        self.store.close()
+
+
+class GuildStates:
+    """Opens each namespace's ``GuildState`` the first time it is needed."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.states: dict[int | None, GuildState] = {}
+        self.running = False
+
+    @staticmethod
+    def namespace(guild_id: int | None) -> int | None:
+        return guild_id if guild_id in configs.guilds else None
+
+    @staticmethod
+    def serves(guild: discord.Guild) -> bool:
+        """Whether ``guild`` has a namespace: its own, or the default one.
+
+        The default namespace belongs to the guild that holds the top-level
+        config's mod-log channel; any other unlisted guild is refused, so it
+        can never read that guild's data.
+        """
+        if guild.id in configs.guilds:
+            return True
+        return guild.get_channel(configs.default.mod_log_channel_id) is not None
+
+    def db_path_for(self, namespace: int | None) -> str:
+        if namespace is None:
+            return self.db_path
+        root, ext = os.path.splitext(self.db_path)
+        return f"{root}-{namespace}{ext}"
+
+    def get(self, guild_id: int | None) -> GuildState:
+        namespace = self.namespace(guild_id)
+        state = self.states.get(namespace)
+        if state is None:
+            state = GuildState(namespace, self.db_path_for(namespace))
+            state.open()
+            if self.running:
+                state.start()
+            self.states[namespace] = state
+        return state
+
+    @property
+    def default(self) -> GuildState:
+        return self.get(None)
+
+    async def open_configured(self):
+        """Open every configured namespace side by side, off the event loop."""
+        opening = [
+            GuildState(namespace, self.db_path_for(namespace))
+            for namespace in (None, *configs.guilds)
+            if namespace not in self.states
+        ]
+        await asyncio.gather(*(asyncio.to_thread(state.open) for state in opening))
+        for state in opening:
+            if self.running:
+                state.start()
+            self.states.setdefault(state.namespace, state)
+
+    def configured(self) -> list[GuildState]:
+        """The default namespace plus every guild listed in the config."""
+        return [self.default, *(self.get(guild_id) for guild_id in configs.guilds)]
+
+    def start(self):
+        self.running = True
+        for state in self.states.values():
+            state.start()
+
+    def close(self):
+        self.running = False
+        for state in self.states.values():
+            state.close()
+
+
+guild_states = GuildStates(CASE_DB_PATH)
+
+
+def state_for(guild_id: int | None) -> GuildState:
+    return guild_states.get(guild_id)
+
+
+# Case numbers are allocated locally and stay far below Discord snowflakes,
+# which is how footers written before case numbers existed are told apart.
+LEGACY_CASE_ID_THRESHOLD = 1 << 32
+
+
+def parse_footer_case_id(embed: discord.Embed) -> int | None:
+    """Return the case number from a ``... ID: <n>`` footer, if it has one."""
+    if not embed.footer or not embed.footer.text:
+        return None
+    _, _, value = embed.footer.text.rpartition(": ")
+    if not value.isdigit() or int(value) >= LEGACY_CASE_ID_THRESHOLD:
+        return None
+    return int(value)
+
+
+def parse_mod_log_message(message: discord.Message) -> tuple | None:
+    """Turn a mod-log embed into a ``mod_cases`` row, or None if it isn't one."""
+    if not message.embeds:
+        return None
+
+    fields = {field.name: field.value for field in message.embeds[0].fields}
+    roblox_username = fields.get("Roblox Username")
+    if not roblox_username:
+        return None
+
+    return (
+        message.id,
+        roblox_username,
+        normalize_username(roblox_username),
+        fields.get("Type", "Unknown"),
+        fields.get("Reason", "Unknown"),
+        fields.get("Moderator", "Unknown"),
+        message.jump_url,
+        message.created_at.timestamp(),
+    )
+
+
+async def sync_mod_log(guild_state: GuildState, channel: discord.TextChannel) -> int:
+    """Stream the mod-log channel into the store, oldest first.
+
+    With no checkpoint this is the one-time backfill of the whole history;
+    afterwards only messages newer than the checkpoint are fetched. The
+    checkpoint advances with every batch, so an interrupted backfill resumes
+    where it stopped.
+    """
+    store = guild_state.store
+    checkpoint = store.get_checkpoint(channel.id)
+    after = discord.Object(id=checkpoint) if checkpoint else None
+
+    batch = []
+    case_ids = []
+    last_message_id = checkpoint
+    synced = 0
+
+    async for message in channel.history(limit=None, after=after, oldest_first=True):
+        last_message_id = message.id
+        case = parse_mod_log_message(message)
+        if case is not None:
+            batch.append(case)
+            guild_state.usernames.add(case[1])
+            case_id = parse_footer_case_id(message.embeds[0])
+            if case_id is not None:
+                case_ids.append((case_id, message.id))
+
+        if len(batch) >= MOD_LOG_SYNC_BATCH_SIZE:
+            store.add_cases_batch(batch, case_ids, channel.id, last_message_id)
+            synced += len(batch)
+            batch = []
+            case_ids = []
+
+    if last_message_id is not None and last_message_id != checkpoint:
+        store.add_cases_batch(batch, case_ids, channel.id, last_message_id)
+        synced += len(batch)
+
+    return synced
+
+
+# ================== WARRANT VIEW ==================
+
+WARRANT_STATE_COLORS = {
+    "pending": discord.Color.blurple(),
+    "approved": discord.Color.green(),
+    "denied": discord.Color.red(),
+}
+
+
+def build_warrant_embed(
+    warrant: sqlite3.Row | dict, templates: EmbedTemplates
+) -> discord.Embed:
+    if warrant["state"] == "pending":
+        status = "Warrant Pending"
+    else:
+        status = f"Warrant {warrant['state'].title()} by {warrant['decided_by']}"
+    embed = templates.embed(
+        "warrant",
+        status=status,
+        requester=warrant["requester"],
+        suspect_username=warrant["suspect_username"],
+        charges=warrant["charges"],
+        warrant_id=warrant["warrant_id"],
+    )
+    embed.color = WARRANT_STATE_COLORS[warrant["state"]]
+    return embed
+
+
+def describe_warrant(warrant: sqlite3.Row) -> str:
+    line = (
+        f"**#{warrant['warrant_id']}** · {warrant['state'].title()} · "
+        f"{warrant['suspect_username']} · {warrant['charges']} · "
+        f"requested by {warrant['requester']}"
+    )
+    if warrant["decided_by"]:
+        decided_at = int(warrant["decided_at"])
+        line += f" · decided by {warrant['decided_by']} <t:{decided_at}:R>"
+    return line
+
+
+# Decisions already applied, by warrant message ID, as (state, decided by).
+# Set before the first await of a decision, so a second click on the same
+# warrant is answered from here without touching the store or the message.
+warrant_decisions: dict[int, tuple[str, str]] = {}
+
+
+class WarrantView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def _button_permission_check(self, interaction: discord.Interaction) -> bool:
+        guild_state = state_for(interaction.guild_id)
+
+        try:
+            return await check_member_roles(
+                interaction,
+                guild_state.config.warrant_button_allowed_roles,
+                "You do not have permission to approve or deny warrants.",
+            )
+        except app_commands.CheckFailure as exc:
+            await interaction.response.send_message(str(exc), ephemeral=True)
+            return False
+
+    def _disable_buttons(self):
+        for item in self.children:
+            item.disabled = True
+
+    async def _decide(self, interaction: discord.Interaction, state: str):
+        guild_state = state_for(interaction.guild_id)
+
+        if not await self._button_permission_check(interaction):
+            return
+
+        message_id = interaction.message.id
+        decision = warrant_decisions.get(message_id)
+        if decision is None:
+            applied, warrant = guild_state.store.decide_warrant(
+                message_id,
+                state,
+                interaction.user.id,
+                interaction.user.display_name,
+            )
+            if warrant is not None and not applied:
+                decision = (warrant["state"], warrant["decided_by"])
+            warrant_decisions[message_id] = decision or (
+                state,
+                interaction.user.display_name,
+            )
+
+        if decision is not None:
+            decided_state, decided_by = decision
+            await interaction.response.send_message(
+                f"This warrant was already {decided_state} by {decided_by}.",
+                ephemeral=True,
+            )
+            return
+
+        if warrant is not None:
+            embed = build_warrant_embed(warrant, guild_state.templates)
+        elif interaction.message.embeds:
+            # Warrant posted before the store existed: recolor its embed.
+            embed = interaction.message.embeds[0].copy()
+            embed.color = WARRANT_STATE_COLORS[state]
+            embed.set_author(
+                name=f"Warrant {state.title()} by {interaction.user.display_name}"
+            )
+        else:
+            del warrant_decisions[message_id]
+            await interaction.response.send_message(
+                "No embed found to update.",
+                ephemeral=True,
+            )
+            return
+
+        await interaction.response.send_message(
+            f"Warrant {state}.",
+            ephemeral=True,
+        )
+
+        self._disable_buttons()
+        await outbound.edit(
+            interaction.message, priority=PRIORITY_HIGH, embed=embed, view=self
+        )
+
+    @discord.ui.button(
+        label="Approve",
+        style=discord.ButtonStyle.success,
+        custom_id="warrant_approve",
+    )
+    async def approve_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        await self._decide(interaction, "approved")
+
+    @discord.ui.button(
+        label="Deny",
+        style=discord.ButtonStyle.danger,
+        custom_id="warrant_deny",
+    )
+    async def deny_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        await self._decide(interaction, "denied")
+
+
+# ================== MODERATION CONFIRM VIEWS ==================
+
+
+class DeleteConfirmView(discord.ui.View):
+    def __init__(self, log_channel_id: int, message_id: int, invoker: discord.Member):
+        super().__init__(timeout=60)
+        self.log_channel_id = log_channel_id
+        self.message_id = message_id
+        self.invoker_id = invoker.id
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.invoker_id:
+            await interaction.response.send_message(
+                "You are not allowed to interact with this confirmation.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Confirm Delete", style=discord.ButtonStyle.danger)
+    async def confirm(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "Guild not found.",
+                ephemeral=True,
+            )
+            return
+
+        channel = guild.get_channel(self.log_channel_id)
+        if channel is None:
+            await interaction.response.send_message(
+                "Log channel not found.",
+                ephemeral=True,
+            )
+            return
+
+        try:
+            msg = await channel.fetch_message(self.message_id)
+        except discord.NotFound:
+            await interaction.response.send_message(
+                "That moderation log message no longer exists.",
+                ephemeral=True,
+            )
+            return
+
+        await msg.delete()
+        state_for(interaction.guild_id).store.delete_case(self.message_id)
+        await interaction.response.edit_message(
+            content="Moderation log deleted.",
+            view=None,
+        )
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        await interaction.response.edit_message(
+            content="Moderation delete cancelled.",
+            view=None,
+        )
+
+
+class EditConfirmView(discord.ui.View):
+    def __init__(
+        self,
+        log_channel_id: int,
+        message_id: int,
+        invoker: discord.Member,
+        new_type: str,
+        new_reason: str,
+    ):
+        super().__init__(timeout=60)
+        self.log_channel_id = log_channel_id
+        self.message_id = message_id
+        self.invoker_id = invoker.id
+        self.new_type = new_type
+        self.new_reason = new_reason
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.invoker_id:
+            await interaction.response.send_message(
+                "You are not allowed to interact with this confirmation.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Confirm Edit", style=discord.ButtonStyle.success)
+    async def confirm(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "Guild not found.",
+                ephemeral=True,
+            )
+            return
+
+        channel = guild.get_channel(self.log_channel_id)
+        if channel is None:
+            await interaction.response.send_message(
+                "Log channel not found.",
+                ephemeral=True,
+            )
+            return
+
+        try:
+            msg = await channel.fetch_message(self.message_id)
+        except discord.NotFound:
+            await interaction.response.send_message(
+                "That moderation log message no longer exists.",
+                ephemeral=True,
+            )
+            return
+
+        if not msg.embeds:
+            await interaction.response.send_message(
+                "That message does not contain an embed.",
+                ephemeral=True,
+            )
+            return
+
+        embed = msg.embeds[0]
+
+        new_embed = discord.Embed(title=embed.title, color=embed.color)
+
+        roblox_username = ""
+        moderator = ""
+
+        for field in embed.fields:
+            if field.name == "Roblox Username":
+                roblox_username = field.value
+            if field.name == "Moderator":
+                moderator = field.value
+
+        new_embed.add_field(
+            name="Roblox Username",
+            value=roblox_username or "Unknown",
+            inline=False,
+        )
+        new_embed.add_field(name="Type", value=self.new_type, inline=False)
+        new_embed.add_field(name="Reason", value=self.new_reason, inline=False)
+        new_embed.add_field(
+            name="Moderator", value=moderator or "Unknown", inline=False
+        )
+
+        if embed.footer and embed.footer.text:
+            new_embed.set_footer(text=embed.footer.text)
+
+        await outbound.edit(msg, priority=PRIORITY_NORMAL, embed=new_embed)
+        state_for(interaction.guild_id).store.update_case(
+            self.message_id, self.new_type, self.new_reason
+        )
+
+        await interaction.response.edit_message(
+            content="Moderation log updated.",
+            view=None,
+        )
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        await interaction.response.edit_message(
+            content="Moderation edit cancelled.",
+            view=None,
+        )
+
+
+# ================== GATEWAY CACHE ==================
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheProfile:
+    """Which gateway events the bot subscribes to and what it keeps from them.
+
+    The bot only reads roles of command invokers (sent with each interaction),
+    voice states in session channels and guild roles/channels, so everything
+    beyond that is memory spent on members and messages it never looks at.
+    """
+
+    members_intent: bool
+    cache_joined_members: bool
+    max_messages: int | None
+    chunk_at_startup: bool
+
+    def intents(self) -> discord.Intents:
+        if self.max_messages:
+            # The message cache is only filled from message events.
+            intents = discord.Intents.default()
+        else:
+            # No message, reaction or typing events: nothing here handles them.
+            intents = discord.Intents.none()
+            intents.guilds = True
+            intents.voice_states = True
+        intents.members = self.members_intent
+        return intents
+
+    def member_cache_flags(self) -> discord.MemberCacheFlags:
+        return discord.MemberCacheFlags(voice=True, joined=self.cache_joined_members)
+
+    def client_options(self) -> dict:
+        return {
+            "intents": self.intents(),
+            "member_cache_flags": self.member_cache_flags(),
+            "max_messages": self.max_messages,
+            "chunk_guilds_at_startup": self.chunk_at_startup,
+        }
+
+
+CACHE_PROFILES = {
+    # Every member chunked on connect plus the default message cache.
+    "full": CacheProfile(
+        members_intent=True,
+        cache_joined_members=True,
+        max_messages=1000,
+        chunk_at_startup=True,
+    ),
+    # Members cached as member and voice events mention them; never chunked.
+    "lazy": CacheProfile(
+        members_intent=True,
+        cache_joined_members=True,
+        max_messages=None,
+        chunk_at_startup=False,
+    ),
+    # Only members currently in voice are cached; no member events at all.
+    "minimal": CacheProfile(
+        members_intent=False,
+        cache_joined_members=False,
+        max_messages=None,
+        chunk_at_startup=False,
+    ),
+}
+
+try:
+    cache_profile = CACHE_PROFILES[CACHE_PROFILE]
+except KeyError:
+    raise ValueError(
+        f"CACHE_PROFILE must be one of {', '.join(CACHE_PROFILES)}, "
+        f"not {CACHE_PROFILE!r}"
+    ) from None
+
+
+# ================== BOT CORE ==================
+
+
+class ManagementBot(discord.AutoShardedClient):
+    def __init__(self):
+        super().__init__(
+            shard_count=SHARD_COUNT or None, **cache_profile.client_options()
+        )
+        self.tree = app_commands.CommandTree(self)
+        self.status_server = StatusServer(
+            STATUS_HOST,
+            STATUS_PORT,
+            ready=self.is_serving,
+            alive=lambda: not self.is_closed(),
+        )
+        instrument_http(self.http)
+
+    def is_serving(self) -> bool:
+        """Started up, connected and not shutting down."""
+        return startup.complete and self.is_ready() and not self.is_closed()
+
+    async def start(self, token: str, *, reconnect: bool = True):
+        # Up before login, so the supervisor's probes are answered throughout.
+        if STATUS_PORT:
+            await self.status_server.start()
+        startup.begin("login")
+        await super().start(token, reconnect=reconnect)
+
+    async def setup_hook(self):
+        startup.end("login")
+        with startup.phase("setup"):
+            # None of this needs the gateway: open the stores (and load their
+            # username indexes) and read the templates in worker threads.
+            template_sets = {templates_for(config) for config in configs.all()}
+            await asyncio.gather(
+                guild_states.open_configured(),
+                *(asyncio.to_thread(templates.load) for templates in template_sets),
+            )
+            guild_states.start()
+            self.add_view(WarrantView())  # persistent warrant buttons
+            self.add_view(SSUVoteView())  # persistent session vote buttons
+        # The command sync only needs REST, so the gateway connects meanwhile.
+        self.command_sync_task = asyncio.create_task(self._startup_command_sync())
+        startup.begin("gateway")
+        self.mod_log_sync_tasks = [
+            asyncio.create_task(self._sync_mod_log(guild_state))
+            for guild_state in guild_states.configured()
+        ]
+        self.no_show_task = asyncio.create_task(self._run_no_show_checks())
+        config_watcher.validators.append(preload_templates)
+        config_watcher.validators.append(self._check_config_change)
+        config_watcher.listeners.append(self._on_config_change)
+        self.config_task = asyncio.create_task(config_watcher.run())
+
+    async def _startup_command_sync(self):
+        with startup.phase("command_sync"):
+            try:
+                await self.sync_commands()
+            except discord.HTTPException as exc:
+                # Commands from the last successful sync keep working.
+                print(f"Slash command sync failed: {exc}")
+
+    async def _sync_mod_log(self, guild_state: GuildState):
+        name = guild_state.namespace or "default"
+        try:
+            channel = await self.fetch_channel(guild_state.config.mod_log_channel_id)
+            synced = await sync_mod_log(guild_state, channel)
+        except discord.HTTPException as exc:
+            print(f"Moderation log sync failed ({name}): {exc}")
+            return
+        print(f"Moderation log sync complete ({name}, {synced} new cases).")
+
+    def _guilds_in(self, guild_state: GuildState) -> list[discord.Guild]:
+        return [
+            guild
+            for guild in self.guilds
+            if guild_states.serves(guild)
+            and guild_states.namespace(guild.id) == guild_state.namespace
+        ]
+
+    def _check_config_change(self, old: GuildConfigs, new: GuildConfigs):
+        """Refuse to list the default namespace's own guild under ``guilds``.
+
+        Its cases, warrants and votes live in the default database, and
+        listing it would silently move it to an empty one.
+        """
+        for guild_id in new.guilds.keys() - old.guilds.keys():
+            guild = self.get_guild(guild_id)
+            if guild is not None and guild.get_channel(old.default.mod_log_channel_id):
+                raise ValueError(
+                    f"guilds.{guild_id}: this guild uses the top-level config "
+                    "and default database; it cannot be moved while running"
+                )
+
+    def _on_config_change(self, old: GuildConfigs, new: GuildConfigs):
+        for guild_state in guild_states.configured():
+            before = old.for_guild(guild_state.namespace)
+            after = new.for_guild(guild_state.namespace)
+            added = guild_state.namespace not in (None, *old.guilds)
+            if added or after.mod_log_channel_id != before.mod_log_channel_id:
+                # A newly listed guild starts from an empty database: backfill.
+                self.mod_log_sync_tasks.append(
+                    asyncio.create_task(self._sync_mod_log(guild_state))
+                )
+            if added or (
+                after.session_voice_channel_ids != before.session_voice_channel_ids
+            ):
+                guild_state.voice.reload(self._guilds_in(guild_state))
+
+    async def _run_no_show_checks(self):
+        await self.wait_until_ready()
+        while True:
+            started_before = time.time() - NO_SHOW_GRACE_SECONDS
+            for guild_state in list(guild_states.states.values()):
+                try:
+                    sessions = guild_state.store.due_sessions(started_before)
+                except Exception:
+                    namespace = guild_state.namespace or "the default guild"
+                    print(f"Could not read due sessions for {namespace}:")
+                    traceback.print_exc()
+                    continue
+                for session in sessions:
+                    vote_message_id = session["vote_message_id"]
+                    try:
+                        await report_no_shows(self, guild_state, session)
+                        guild_state.store.mark_session_reported(vote_message_id)
+                    except discord.HTTPException as exc:
+                        print(f"Could not post no-shows for {vote_message_id}: {exc}")
+                    except Exception:
+                        print(f"No-show report for {vote_message_id} failed:")
+                        traceback.print_exc()
+            await asyncio.sleep(NO_SHOW_CHECK_SECONDS)
+
+    async def close(self):
+        await outbound.drain()
+        await super().close()
+        await self.status_server.stop()
+        guild_states.close()
+
+    def command_tree_hash(self, guild: discord.Object | None = None) -> str:
+        commands = sorted(
+            (
+                command.to_dict(self.tree)
+                for command in self.tree.get_commands(guild=guild)
+            ),
+            key=lambda payload: (payload.get("type", 1), payload["name"]),
+        )
+        payload = json.dumps(commands, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def sync_commands(self):
+        """Upload the command tree only when it differs from the last upload.
+
+        The hash of the serialized tree is kept in the store per sync scope,
+        so restarts and reconnects with unchanged commands skip the heavily
+        rate-limited sync entirely. The global scope is always synced; with
+        SYNC_GUILD_ID set the commands are also copied to that guild as an
+        extra scope, where changes show up immediately.
+        """
+        scopes: list[discord.Object | None] = [None]
+        if SYNC_GUILD_ID:
+            guild = discord.Object(id=SYNC_GUILD_ID)
+            self.tree.copy_global_to(guild=guild)
+            scopes.append(guild)
+
+        store = guild_states.default.store
+        for guild in scopes:
+            name = guild.id if guild is not None else "global"
+            scope = f"command_tree_hash:{name}"
+            tree_hash = self.command_tree_hash(guild)
+            if store.get_meta(scope) == tree_hash:
+                print(f"Slash commands unchanged ({name}); skipping sync.")
+                continue
+
+            await self.tree.sync(guild=guild)
+            store.set_meta(scope, tree_hash)
+            print(f"Slash commands synced ({name}).")
+
+    async def on_ready(self):
+        for guild in self.guilds:
+            if guild_states.serves(guild):
+                guild_states.get(guild.id)
+        for guild_state in list(guild_states.states.values()):
+            guild_state.voice.reload(self._guilds_in(guild_state))
+        print(
+            f"Logged in as {self.user} (SLCWL Management), "
+            f"{len(self.guilds)} guild(s) on {self.shard_count} shard(s)"
+        )
+        startup.end("gateway")
+
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ):
+        if not member.bot and guild_states.serves(member.guild):
+            state_for(member.guild.id).voice.update(
+                member.id, before.channel, after.channel
+            )
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        permissions.invalidate_member(after.guild.id, after.id)
+
+    async def on_member_remove(self, member: discord.Member):
+        permissions.invalidate_member(member.guild.id, member.id)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        permissions.invalidate_guild(after.guild.id)
+
+    async def on_guild_role_delete(self, role: discord.Role):
+        permissions.invalidate_guild(role.guild.id)
+
+
+bot = ManagementBot()
+
+
+@bot.tree.error
+async def on_app_command_error(
+    interaction: discord.Interaction, error: app_commands.AppCommandError
+):
+    if isinstance(error, app_commands.CheckFailure):
+        await respond(interaction, str(error), ephemeral=True)
+        return
+    command = interaction.command.name if interaction.command else "unknown"
+    print(f"Error in /{command}:")
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+# ================== SSU / SSD ==================
+
+
+@bot.tree.command(name="ssu", description="Send the SSU announcement.")
+@require_roles("ssu_required_role_id")
+@deferred
+async def ssu(interaction: discord.Interaction):
+    guild_state = state_for(interaction.guild_id)
+
+    channel_id = guild_state.config.ssu_ssd_target_channel_id
+    channel = interaction.guild.get_channel(channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the SSU announcement channel.",
+            ephemeral=True,
+        )
+        return
+
+    await outbound.send(
+        channel,
+        priority=PRIORITY_HIGH,
+        content="@everyone",
+        allowed_mentions=discord.AllowedMentions(everyone=True),
+        **guild_state.templates.message("ssu"),
+    )
+
+    voted_since = time.time() - SESSION_VOTE_MAX_AGE_SECONDS
+    report_channel_id = guild_state.config.no_show_report_channel_id
+    if guild_state.store.start_session(voted_since) is None or not report_channel_id:
+        await respond(
+            interaction,
+            f"SSU announcement sent in {channel.mention}.",
+            ephemeral=True,
+        )
+        return
+
+    await respond(
+        interaction,
+        f"SSU announcement sent in {channel.mention}. Voters missing from voice "
+        f"will be listed in <#{report_channel_id}> in "
+        f"{NO_SHOW_GRACE_SECONDS // 60} minutes.",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(name="ssd", description="Send the SSD announcement.")
+@require_roles("ssu_required_role_id")
+@deferred
+async def ssd(interaction: discord.Interaction):
+    guild_state = state_for(interaction.guild_id)
+
+    channel_id = guild_state.config.ssu_ssd_target_channel_id
+    channel = interaction.guild.get_channel(channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the SSD announcement channel.",
+            ephemeral=True,
+        )
+        return
+
+    await outbound.send(
+        channel, priority=PRIORITY_HIGH, **guild_state.templates.message("ssd")
+    )
+
+    await respond(
+        interaction,
+        f"SSD announcement sent in {channel.mention}.",
+        ephemeral=True,
+    )
+
+
+# ================== CHARGES ==================
+
+# Canonical charge names and the spellings officers use for them. Charges not
+# listed here are still counted, under their own capitalized text.
+CHARGE_ALIASES = {
+    "Evasion": (
+        "evasion", "evading", "evading police", "evading arrest", "fleeing",
+        "fleeing police", "felony evasion",
+    ),
+    "Reckless Driving": ("reckless driving", "reckless", "rd"),
+    "Speeding": ("speeding", "excessive speeding"),
+    "Running a Red Light": ("running a red light", "red light"),
+    "Hit and Run": ("hit and run", "hit n run"),
+    "Driving Without a License": (
+        "driving without a license", "no license", "unlicensed driving",
+    ),
+    "Grand Theft Auto": ("grand theft auto", "gta", "vehicle theft", "car theft"),
+    "Theft": ("theft", "grand theft", "stealing"),
+    "Robbery": ("robbery", "bank robbery", "store robbery"),
+    "Armed Robbery": ("armed robbery",),
+    "Assault": ("assault", "battery", "assault and battery"),
+    "Assault with a Deadly Weapon": (
+        "assault with a deadly weapon", "adw", "awdw",
+    ),
+    "Attempted Murder": ("attempted murder",),
+    "Murder": ("murder", "homicide"),
+    "Manslaughter": ("manslaughter", "vehicular manslaughter"),
+    "Kidnapping": ("kidnapping", "kidnap"),
+    "Resisting Arrest": ("resisting arrest", "resisting", "rta"),
+    "Obstruction of Justice": ("obstruction of justice", "obstruction"),
+    "Illegal Firearm Possession": (
+        "illegal firearm possession", "possession of an illegal firearm",
+        "illegal weapon", "illegal weapons possession",
+    ),
+    "Impersonating an Officer": (
+        "impersonating an officer", "impersonation", "impersonating police",
+    ),
+    "Trespassing": ("trespassing", "trespass"),
+    "Vandalism": ("vandalism",),
+    "Disorderly Conduct": ("disorderly conduct",),
+}
+
+
+def _charge_key(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.casefold()).split())
+
+
+CHARGE_NAMES = {
+    _charge_key(alias): name
+    for name, aliases in CHARGE_ALIASES.items()
+    for alias in (name, *aliases)
+}
+
+_CHARGE_SEPARATOR = re.compile(r"[,;\n]+")
+# A bare leading number is part of the charge ("100 mph over"), and a
+# trailing x<n> needs a word break first so "tax2" is not 2x "Ta".
+_LEADING_COUNT = re.compile(r"^(\d+)\s*(?:[x×*]|counts?\s+of\b)\s*(.+)$", re.I)
+_TRAILING_COUNT = re.compile(
+    r"^(.+?)(?:(?:\s+|\b)[x×*]\s*(\d+)|\s+(\d+)\s*[x×]|\s*\((\d+)\))$", re.I
+)
+# Parts that are nothing but a count, such as "1x", "x2" or "(2)".
+_COUNT_ONLY = re.compile(r"[\s()x×*]*\d[\d\s()x×*]*", re.I)
+
+
+def normalize_charge(text: str) -> str:
+    key = _charge_key(text)
+    return CHARGE_NAMES.get(key, " ".join(word.capitalize() for word in key.split()))
+
+
+def parse_charges(text: str) -> list[tuple[int, str]]:
+    """Split ``"1x evasion, 2x reckless driving"`` into ``(count, charge)``.
+
+    Counts may lead (``2x``, ``2 *``, ``2 counts of``) or trail (``x2``,
+    ``2x``, ``(2)``) and default to 1; a leading number without one of those
+    markers is part of the charge. Charges are mapped onto
+    ``CHARGE_ALIASES``, repeats of the same charge are added together, and
+    parts that are only a count are skipped.
+    """
+    totals: dict[str, int] = {}
+    for part in _CHARGE_SEPARATOR.split(text):
+        part = part.strip()
+        if _COUNT_ONLY.fullmatch(part):
+            continue
+        count = 1
+        if match := _LEADING_COUNT.match(part):
+            count = int(match[1])
+            part = match[2]
+        elif match := _TRAILING_COUNT.match(part):
+            count = int(match[2] or match[3] or match[4])
+            part = match[1]
+        charge = normalize_charge(part)
+        if charge and count > 0:
+            totals[charge] = totals.get(charge, 0) + count
+    return [(count, charge) for charge, count in totals.items()]
+
+
+async def charge_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    key = _charge_key(current)
+    names = [name for name in CHARGE_ALIASES if key in _charge_key(name)]
+    return [
+        app_commands.Choice(name=name, value=name)
+        for name in names[:AUTOCOMPLETE_LIMIT]
+    ]
+
+
+# ================== WARRANT COMMANDS ==================
+
+
+@bot.tree.command(name="warrant", description="Create a warrant request.")
+@app_commands.describe(
+    suspect_username="Suspect's username",
+    charges="List the charges",
+)
+@app_commands.autocomplete(suspect_username=username_autocomplete)
+@require_roles(
+    "create_warrant_role_id",
+    message="You do not have permission to create warrants.",
+)
+@deferred
+async def warrant(
+    interaction: discord.Interaction, suspect_username: str, charges: str
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    channel = interaction.guild.get_channel(guild_state.config.warrant_channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the warrant channel.",
+            ephemeral=True,
+        )
+        return
+
+    warrant_id = guild_state.store.allocate_case_id("warrant")
+    embed = build_warrant_embed(
+        {
+            "warrant_id": warrant_id,
+            "requester": member.mention,
+            "suspect_username": suspect_username,
+            "charges": charges,
+            "state": "pending",
+        },
+        guild_state.templates,
+    )
+
+    view = WarrantView()
+
+    message = await outbound.send(channel, embed=embed, view=view)
+    guild_state.usernames.add(suspect_username)
+    guild_state.store.link_case("warrant", warrant_id, message.id)
+    guild_state.store.add_warrant(
+        warrant_id, message.id, suspect_username, member.id, member.mention, charges
+    )
+    guild_state.store.add_charges(
+        "warrant", warrant_id, message.id, parse_charges(charges)
+    )
+
+    await respond(
+        interaction,
+        f"Warrant created in {channel.mention}",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(
+    name="warrant_lookup",
+    description="Look up warrants by ID, suspect or requesting officer.",
+)
+@app_commands.describe(
+    warrant_id="The Warrant ID found in the embed footer",
+    suspect_username="List every warrant for this suspect",
+    officer="List every warrant requested by this officer",
+)
+@app_commands.autocomplete(suspect_username=username_autocomplete)
+@app_commands.guild_only()
+@guild_served_only()
+@deferred
+async def warrant_lookup(
+    interaction: discord.Interaction,
+    warrant_id: str | None = None,
+    suspect_username: str | None = None,
+    officer: discord.Member | None = None,
+):
+    guild_state = state_for(interaction.guild_id)
+
+    if suspect_username is not None or officer is not None:
+        # Listing modes expose every warrant, like /warrants_pending.
+        try:
+            await check_member_roles(
+                interaction,
+                guild_state.config.role_ids(
+                    "create_warrant_role_id", "warrant_button_allowed_roles"
+                ),
+                "You do not have permission to list warrants.",
+            )
+        except app_commands.CheckFailure as exc:
+            await respond(interaction, str(exc), ephemeral=True)
+            return
+
+    if suspect_username is not None:
+        await respond_paginated(
+            interaction,
+            map(
+                describe_warrant,
+                guild_state.store.warrants_for_suspect(suspect_username),
+            ),
+            header=f"Warrants for suspect '{suspect_username}':",
+            empty_message=f"No warrants found for suspect '{suspect_username}'.",
+        )
+        return
+
+    if officer is not None:
+        await respond_paginated(
+            interaction,
+            map(describe_warrant, guild_state.store.warrants_by_requester(officer.id)),
+            header=f"Warrants requested by {officer.mention}:",
+            empty_message=f"No warrants found requested by {officer.mention}.",
+        )
+        return
+
+    if warrant_id is None:
+        await respond(
+            interaction,
+            "Provide a warrant ID, a suspect username or an officer.",
+            ephemeral=True,
+        )
+        return
+
+    warrant_number = parse_id(warrant_id)
+    if warrant_number is None:
+        await respond(
+            interaction,
+            "No warrant found with that ID.",
+            ephemeral=True,
+        )
+        return
+
+    warrant = guild_state.store.get_warrant(warrant_number)
+    if warrant is not None:
+        embed = build_warrant_embed(warrant, guild_state.templates)
+        await respond(interaction, embed=embed, ephemeral=True)
+        return
+
+    # Warrants posted before the store existed are only in the channel.
+    channel = interaction.guild.get_channel(guild_state.config.warrant_channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the warrant channel.",
+            ephemeral=True,
+        )
+        return
+
+    try:
+        message_id = guild_state.store.resolve_message_id("warrant", warrant_number)
+        message = await channel.fetch_message(message_id)
+    except Exception:
+        await respond(
+            interaction,
+            "No warrant found with that ID.",
+            ephemeral=True,
+        )
+        return
+
+    if not message.embeds:
+        await respond(
+            interaction,
+            "This message does not contain a valid warrant.",
+            ephemeral=True,
+        )
+        return
+
+    embed = message.embeds[0]
+
+    await respond(interaction, embed=embed, ephemeral=True)
+
+
+@bot.tree.command(
+    name="warrants_pending",
+    description="List every warrant still waiting for a decision.",
+)
+@require_roles("create_warrant_role_id", "warrant_button_allowed_roles")
+@deferred
+async def warrants_pending(interaction: discord.Interaction):
+    guild_state = state_for(interaction.guild_id)
+
+    await respond_paginated(
+        interaction,
+        map(describe_warrant, guild_state.store.pending_warrants()),
+        header="Pending warrants:",
+        empty_message="There are no pending warrants.",
+    )
+
+
+# ================== MODERATION COMMANDS ==================
+
+
+async def get_mod_log_channel(guild: discord.Guild):
+    return guild.get_channel(config_for(guild.id).mod_log_channel_id)
+
+
+@bot.tree.command(
+    name="log_moderation",
+    description="Log a moderation action for a Roblox user.",
+)
+@app_commands.describe(
+    roblox_username="Roblox username of the user being moderated",
+    mod_type="Type of moderation (e.g., Strike 1, Strike 2, Removal)",
+    reason="Reason for the moderation action",
+)
+@app_commands.autocomplete(roblox_username=username_autocomplete)
+@require_roles("mod_required_role_id")
+@deferred
+async def log_moderation(
+    interaction: discord.Interaction,
+    roblox_username: str,
+    mod_type: str,
+    reason: str,
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    log_channel = await get_mod_log_channel(interaction.guild)
+    if log_channel is None:
+        await respond(
+            interaction,
+            "Could not find the moderation log channel.",
+            ephemeral=True,
+        )
+        return
+
+    case_id = guild_state.store.allocate_case_id("moderation")
+    embed = guild_state.templates.embed(
+        "mod_log",
+        roblox_username=roblox_username,
+        mod_type=mod_type,
+        reason=reason,
+        moderator=member.mention,
+        case_id=case_id,
+    )
+
+    message = await outbound.send(log_channel, embed=embed)
+
+    guild_state.usernames.add(roblox_username)
+    guild_state.store.link_case("moderation", case_id, message.id)
+    guild_state.store.add_case(
+        message.id,
+        roblox_username,
+        mod_type,
+        reason,
+        member.mention,
+        message.jump_url,
+    )
+
+    await respond(
+        interaction,
+        f"Moderation logged in {log_channel.mention} with ID {case_id}.",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(
+    name="moderation_logs",
+    description="View moderation logs for a Roblox user.",
+)
+@app_commands.describe(
+    roblox_username="Roblox username to search for",
+)
+@app_commands.autocomplete(roblox_username=username_autocomplete)
+@require_roles("mod_required_role_id")
+@deferred
+async def moderation_logs(
+    interaction: discord.Interaction, roblox_username: str
+):
+    guild_state = state_for(interaction.guild_id)
+
+    entries = (
+        f"ID: {case['case_id'] or case['message_id']}\n"
+        f"Type: {case['mod_type']}\n"
+        f"Reason: {case['reason']}\n"
+        f"Moderator: {case['moderator']}\n"
+        f"Link: {case['jump_url']}"
+        for case in guild_state.store.iter_cases_for_user(roblox_username)
+    )
+
+    await respond_paginated(
+        interaction,
+        entries,
+        header=f"Moderation logs for Roblox user '{roblox_username}':",
+        empty_message=f"No moderation logs found for Roblox user '{roblox_username}'.",
+        separator="\n\n",
+    )
+
+
+@bot.tree.command(
+    name="moderation_delete",
+    description="Delete a moderation log by its ID.",
+)
+@app_commands.describe(
+    moderation_id="The Moderation ID (shown in the log footer)",
+)
+@require_roles("mod_required_role_id")
+@deferred
+async def moderation_delete(
+    interaction: discord.Interaction, moderation_id: str
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    log_channel = await get_mod_log_channel(interaction.guild)
+    if log_channel is None:
+        await respond(
+            interaction,
+            "Could not find the moderation log channel.",
+            ephemeral=True,
+        )
+        return
+
+    try:
+        message_id = guild_state.store.resolve_message_id(
+            "moderation", int(moderation_id)
+        )
+        msg = await log_channel.fetch_message(message_id)
+    except Exception:
+        await respond(
+            interaction,
+            "No moderation log found with that ID.",
+            ephemeral=True,
+        )
+        return
+
+    if not msg.embeds:
+        await respond(
+            interaction,
+            "That message does not contain a moderation embed.",
+            ephemeral=True,
+        )
+        return
+
+    embed = msg.embeds[0]
+    summary = [f"Moderation ID: {moderation_id}"]
+    for field in embed.fields:
+        summary.append(f"{field.name}: {field.value}")
+
+    text = "\n".join(summary)
+
+    view = DeleteConfirmView(guild_state.config.mod_log_channel_id, message_id, member)
+
+    await respond(
+        interaction,
+        f"You are about to delete this moderation log:\n\n{text}",
+        view=view,
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(
+    name="moderation_edit",
+    description="Edit a moderation log by its ID.",
+)
+@app_commands.describe(
+    moderation_id="The Moderation ID (shown in the log footer)",
+    new_type="New moderation type (e.g., Strike 1, Strike 2, Removal)",
+    new_reason="New reason for the moderation action",
+)
+@require_roles("mod_required_role_id")
+@deferred
+async def moderation_edit(
+    interaction: discord.Interaction,
+    moderation_id: str,
+    new_type: str,
+    new_reason: str,
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    log_channel = await get_mod_log_channel(interaction.guild)
+    if log_channel is None:
+        await respond(
+            interaction,
+            "Could not find the moderation log channel.",
+            ephemeral=True,
+        )
+        return
+
+    try:
+        message_id = guild_state.store.resolve_message_id(
+            "moderation", int(moderation_id)
+        )
+        msg = await log_channel.fetch_message(message_id)
+    except Exception:
+        await respond(
+            interaction,
+            "No moderation log found with that ID.",
+            ephemeral=True,
+        )
+        return
+
+    if not msg.embeds:
+        await respond(
+            interaction,
+            "That message does not contain a moderation embed.",
+            ephemeral=True,
+        )
+        return
+
+    embed = msg.embeds[0]
+
+    summary = [f"Moderation ID: {moderation_id}"]
+    for field in embed.fields:
+        summary.append(f"{field.name}: {field.value}")
+    summary.append("")
+    summary.append("New values:")
+    summary.append(f"Type: {new_type}")
+    summary.append(f"Reason: {new_reason}")
+
+    text = "\n".join(summary)
+
+    view = EditConfirmView(
+        guild_state.config.mod_log_channel_id,
+        message_id,
+        member,
+        new_type,
+        new_reason,
+    )
+
+    await respond(
+        interaction,
+        f"You are about to edit this moderation log:\n\n{text}",
+        view=view,
+        ephemeral=True,
+    )
+
+
+# ================== CITATION ==================
+
+FINE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+# Plain digits with an optional fraction; no signs, exponents or "inf"/"nan".
+_FINE_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+CITATION_STATS_LIMIT = 10
+
+
+def parse_fine_amount(text: str) -> int | None:
+    """Read a fine such as ``5,000``, ``$2500`` or ``10k`` as a whole number.
+
+    Returns None for anything that is not a non-negative whole amount.
+    """
+    cleaned = text.strip().lower().replace(",", "").replace("_", "").replace(" ", "")
+    cleaned = cleaned.strip("$")
+    multiplier = 1
+    if cleaned[-1:] in FINE_SUFFIXES:
+        multiplier = FINE_SUFFIXES[cleaned[-1]]
+        cleaned = cleaned[:-1]
+    if not cleaned.isascii() or not _FINE_NUMBER.fullmatch(cleaned):
+        return None
+    try:
+        with localcontext(traps=[Inexact]):
+            amount = Decimal(cleaned) * multiplier
+    except DecimalException:
+        return None
+    if amount != amount.to_integral_value():
+        return None
+    if amount > SQLITE_MAX_INTEGER:
+        return None
+    return int(amount)
+
+
+@bot.tree.command(
+    name="citation_log",
+    description="Log a citation for a suspect.",
+)
+@app_commands.describe(
+    suspect_username="Suspect's Roblox username",
+    reason="Reason for the citation",
+    fine_amount="Fine amount (e.g. 5,000 or 10k)",
+)
+@app_commands.autocomplete(suspect_username=username_autocomplete)
+@require_roles("citation_required_role_id")
+@deferred
+async def citation_log(
+    interaction: discord.Interaction,
+    suspect_username: str,
+    reason: str,
+    fine_amount: str,
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    fine = parse_fine_amount(fine_amount)
+    if fine is None:
+        await respond(
+            interaction,
+            f"Could not read the fine amount '{fine_amount}'. "
+            "Use a whole number such as 5,000 or 10k.",
+            ephemeral=True,
+        )
+        return
+
+    channel = interaction.guild.get_channel(guild_state.config.citation_channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the citation log channel.",
+            ephemeral=True,
+        )
+        return
+
+    citation_id = guild_state.store.allocate_case_id("citation")
+    embed = guild_state.templates.embed(
+        "citation_log",
+        suspect_username=suspect_username,
+        reason=reason,
+        fine=f"{fine:,}",
+        officer=member.mention,
+        citation_id=citation_id,
+    )
+
+    message = await outbound.send(channel, embed=embed)
+    guild_state.usernames.add(suspect_username)
+    guild_state.store.link_case("citation", citation_id, message.id)
+    guild_state.store.add_citation(
+        citation_id, message.id, suspect_username, member.id, fine
+    )
+    guild_state.store.index_record(
+        "citation",
+        message.id,
+        citation_id,
+        suspect_username,
+        f"{reason} - fine {fine:,} (by {member.mention})",
+        message.jump_url,
+    )
+
+    await respond(
+        interaction,
+        f"Citation logged in {channel.mention} with ID {citation_id}.",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(
+    name="citation_stats",
+    description="Show fine totals per user, top offenders and fines per period.",
+)
+@app_commands.describe(
+    suspect_username="Show the fine total for one user",
+    period="Group fines per day, week or month",
+)
+@app_commands.autocomplete(suspect_username=username_autocomplete)
+@require_roles("citation_required_role_id")
+@deferred
+async def citation_stats(
+    interaction: discord.Interaction,
+    suspect_username: str | None = None,
+    period: StatsPeriod = "week",
+):
+    guild_state = state_for(interaction.guild_id)
+
+    if suspect_username is not None:
+        total = guild_state.store.fine_total_for(suspect_username)
+        if total is None:
+            await respond(
+                interaction,
+                f"No citations found for '{suspect_username}'.",
+                ephemeral=True,
+            )
+            return
+        await respond(
+            interaction,
+            f"**{total['suspect_username']}** has {total['citations']} "
+            f"citation(s) totalling {total['total_fine']:,} in fines.",
+            ephemeral=True,
+        )
+        return
+
+    offenders = guild_state.store.top_fined(CITATION_STATS_LIMIT)
+    if not offenders:
+        await respond(interaction, "No citations have been logged yet.", ephemeral=True)
+        return
+
+    lines = ["**Top offenders by fines:**"]
+    lines += [
+        f"{rank}. {row['suspect_username']} - {row['total_fine']:,} "
+        f"({row['citations']} citation(s))"
+        for rank, row in enumerate(offenders, start=1)
+    ]
+    lines.append(f"\n**Fines per {period}:**")
+    lines += [
+        f"<t:{row['period_start']}:D> - {row['total_fine']:,} "
+        f"({row['citations']} citation(s))"
+        for row in guild_state.store.fines_by_period(period)
+    ]
+    await respond(interaction, "\n".join(lines), ephemeral=True)
+
+
+# ================== ARREST ==================
+
+
+@bot.tree.command(
+    name="arrest_log",
+    description="Log an arrest for a suspect.",
+)
+@app_commands.describe(
+    suspect_username="Suspect's Roblox username",
+    charges="Charges for the arrest (e.g. 1x evasion, 2x reckless driving)",
+)
+@app_commands.autocomplete(suspect_username=username_autocomplete)
+@require_roles("arrest_required_role_id")
+@deferred
+async def arrest_log(
+    interaction: discord.Interaction, suspect_username: str, charges: str
+):
+    guild_state = state_for(interaction.guild_id)
+
+    member = interaction.user
+
+    channel = interaction.guild.get_channel(guild_state.config.arrest_channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the arrest log channel.",
+            ephemeral=True,
+        )
+        return
+
+    arrest_id = guild_state.store.allocate_case_id("arrest")
+    embed = guild_state.templates.embed(
+        "arrest_log",
+        suspect_username=suspect_username,
+        charges=charges,
+        officer=member.mention,
+        arrest_id=arrest_id,
+    )
+
+    message = await outbound.send(channel, embed=embed)
+    guild_state.usernames.add(suspect_username)
+    guild_state.store.link_case("arrest", arrest_id, message.id)
+    guild_state.store.add_charges(
+        "arrest", arrest_id, message.id, parse_charges(charges)
+    )
+    guild_state.store.index_record(
+        "arrest",
+        message.id,
+        arrest_id,
+        suspect_username,
+        f"{charges} (by {member.mention})",
+        message.jump_url,
+    )
+
+    await respond(
+        interaction,
+        f"Arrest logged in {channel.mention} with ID {arrest_id}.",
+        ephemeral=True,
+    )
+
+
+CHARGE_STATS_LIMIT = 10
+
+
+@bot.tree.command(
+    name="charge_stats",
+    description="Show the most common charges, or every record with a charge.",
+)
+@app_commands.describe(
+    charge="List every record with this charge",
+    kind="Count arrests or warrants",
+    period="Most common charges this day, week or month",
+)
+@app_commands.autocomplete(charge=charge_autocomplete)
+@require_roles("arrest_required_role_id", "create_warrant_role_id")
+@deferred
+async def charge_stats(
+    interaction: discord.Interaction,
+    charge: str | None = None,
+    kind: Literal["arrest", "warrant"] = "arrest",
+    period: StatsPeriod = "week",
+):
+    guild_state = state_for(interaction.guild_id)
+
+    label = RECORD_KIND_LABELS[kind].lower()
+
+    if charge is not None:
+        charge = normalize_charge(charge)
+        await respond_paginated(
+            interaction,
+            map(describe_record, guild_state.store.records_with_charge(kind, charge)),
+            header=f"Every {label} with charge '{charge}':",
+            empty_message=f"No {label}s found with charge '{charge}'.",
+        )
+        return
+
+    rows = guild_state.store.top_charges(kind, period, CHARGE_STATS_LIMIT)
+    if not rows:
+        await respond(
+            interaction,
+            f"No {label} charges have been logged this {period}.",
+            ephemeral=True,
+        )
+        return
+
+    lines = [f"**Most common {label} charges this {period}:**"]
+    lines += [
+        f"{rank}. {row['charge']} - {row['total']}"
+        for rank, row in enumerate(rows, start=1)
+    ]
+    await respond(interaction, "\n".join(lines), ephemeral=True)
+
+
+# ================== RECORD SEARCH ==================
+
+RECORD_KIND_LABELS = {
+    "moderation": "Moderation",
+    "citation": "Citation",
+    "arrest": "Arrest",
+    "warrant": "Warrant",
+}
+
+
+def describe_record(record: sqlite3.Row) -> str:
+    line = (
+        f"<t:{int(record['created_at'])}:d> · "
+        f"**{RECORD_KIND_LABELS[record['kind']]} #{record['record_id']}** · "
+        f"{record['summary']}"
+    )
+    if record["jump_url"]:
+        line += f" · [link]({record['jump_url']})"
+    return line
+
+
+@bot.tree.command(
+    name="record",
+    description="Show every moderation, citation, arrest and warrant for a user.",
+)
+@app_commands.describe(
+    roblox_username="Roblox username to search for",
+)
+@app_commands.autocomplete(roblox_username=username_autocomplete)
+@require_roles("mod_required_role_id", "citation_required_role_id")
+@deferred
+async def record(interaction: discord.Interaction, roblox_username: str):
+    guild_state = state_for(interaction.guild_id)
+
+    await respond_paginated(
+        interaction,
+        map(describe_record, guild_state.store.records_for_user(roblox_username)),
+        header=f"Record for Roblox user '{roblox_username}':",
+        empty_message=f"No records found for Roblox user '{roblox_username}'.",
+    )
+
+
+# Session Vote Thing
+
+
+class VoteTracker:
+    """Session vote attendance, keyed by vote message ID.
+
+    Toggles only touch the in-memory sets and a pending-change map; the
+    flush loop writes whatever accumulated since the last flush in a single
+    transaction, so a rush of clicks costs one write every few seconds.
+    Sets are loaded from the store the first time a vote is touched after a
+    restart.
+
+    The attendee count on the vote embed is refreshed the same way: clicks
+    only mark the message as changed, and the counter loop edits each changed
+    message at most once per ``VOTE_COUNTER_EDIT_SECONDS``.
+    """
+
+    def __init__(self, store: CaseStore):
+        self.store = store
+        self.votes: dict[int, set[int]] = {}
+        self.pending: dict[tuple[int, int], bool] = {}
+        self.changed_messages: dict[int, discord.Message] = {}
+        self.shown_counts: dict[int, int] = {}
+
+    def attendees(self, message_id: int) -> set[int]:
+        attendees = self.votes.get(message_id)
+        if attendees is None:
+            attendees = self.votes[message_id] = self.store.vote_attendees(message_id)
+        return attendees
+
+    def start(self, message_id: int, channel_id: int, session_time: str):
+        self.store.add_vote(message_id, channel_id, session_time)
+        self.votes[message_id] = set()
+
+    def toggle(self, message_id: int, user_id: int) -> bool:
+        """Flip a user's attendance and return whether they now attend."""
+        attendees = self.attendees(message_id)
+        attending = user_id not in attendees
+        if attending:
+            attendees.add(user_id)
+        else:
+            attendees.discard(user_id)
+        self.pending[(message_id, user_id)] = attending
+        return attending
+
+    def mark_changed(self, message: discord.Message):
+        self.changed_messages[message.id] = message
+
+    def flush(self):
+        if not self.pending:
+            return
+        changes = [(m, u, attending) for (m, u), attending in self.pending.items()]
+        self.store.apply_vote_changes(changes)
+        # Only dropped once written; a failed write is retried next flush.
+        self.pending = {}
+
+    async def refresh_counters(self):
+        changed, self.changed_messages = self.changed_messages, {}
+        for message_id, message in changed.items():
+            try:
+                await self.refresh_counter(message_id, message)
+            except discord.HTTPException as exc:
+                print(f"Could not update attendee count on {message_id}: {exc}")
+            except Exception:
+                print(f"Attendee count update on {message_id} failed:")
+                traceback.print_exc()
+
+    async def refresh_counter(self, message_id: int, message: discord.Message):
+        count = len(self.attendees(message_id))
+        if self.shown_counts.get(message_id) == count or not message.embeds:
+            return
+        embed = with_attendee_count(message.embeds[0], count)
+        await outbound.edit(message, embed=embed)
+        self.shown_counts[message_id] = count
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(VOTE_FLUSH_SECONDS)
+            try:
+                self.flush()
+            except sqlite3.Error as exc:
+                print(f"Could not save {len(self.pending)} vote change(s): {exc}")
+
+    async def run_counters(self):
+        while True:
+            await asyncio.sleep(VOTE_COUNTER_EDIT_SECONDS)
+            try:
+                await self.refresh_counters()
+            except Exception:
+                print("Attendee count refresh failed:")
+                traceback.print_exc()
+
+
+def with_attendee_count(embed: discord.Embed, count: int) -> discord.Embed:
+    embed = embed.copy()
+    for index, field in enumerate(embed.fields):
+        if field.name == "Attendees":
+            embed.set_field_at(index, name="Attendees", value=str(count), inline=False)
+            return embed
+    embed.add_field(name="Attendees", value=str(count), inline=False)
+    return embed
+
+
+class VoicePresence:
+    """Who is, or was recently, in a session voice channel.
+
+    Kept in memory from ``on_voice_state_update`` and seeded from the cached
+    voice states on connect, so checking a few hundred voters needs no API
+    calls. Time spent in voice before a restart is not remembered.
+    """
+
+    def __init__(self, namespace: int | None):
+        self.namespace = namespace
+        self.in_voice: set[int] = set()
+        self.last_seen: dict[int, float] = {}
+
+    def is_session_channel(self, channel: discord.abc.Connectable | None) -> bool:
+        if channel is None:
+            return False
+        voice_channel_ids = config_for(self.namespace).session_voice_channel_ids
+        return not voice_channel_ids or channel.id in voice_channel_ids
+
+    def load(self, guild: discord.Guild):
+        now = time.time()
+        for channel in (*guild.voice_channels, *guild.stage_channels):
+            if not self.is_session_channel(channel):
+                continue
+            for member in channel.members:
+                if not member.bot:
+                    self.in_voice.add(member.id)
+                    self.last_seen[member.id] = now
+
+    def reload(self, guilds: list[discord.Guild]):
+        """Re-read who is in voice, e.g. after the session channels changed."""
+        self.in_voice.clear()
+        for guild in guilds:
+            self.load(guild)
+
+    def update(self, user_id: int, before, after):
+        if user_id in self.in_voice or self.is_session_channel(before):
+            self.last_seen[user_id] = time.time()
+        if self.is_session_channel(after):
+            self.in_voice.add(user_id)
+            self.last_seen[user_id] = time.time()
+        else:
+            self.in_voice.discard(user_id)
+
+    def present_since(self, user_id: int, since: float) -> bool:
+        return user_id in self.in_voice or self.last_seen.get(user_id, 0.0) >= since
+
+
+def find_no_shows(guild_state: GuildState, session: sqlite3.Row) -> list[int]:
+    """Vote attendees who have not been in voice since the session started."""
+    return sorted(
+        user_id
+        for user_id in guild_state.votes.attendees(session["vote_message_id"])
+        if not guild_state.voice.present_since(user_id, session["started_at"])
+    )
+
+
+def chunk_lines(lines: list[str], limit: int = PAGE_CHAR_LIMIT):
+    """Group ``lines`` into newline-joined messages of at most ``limit`` chars."""
+    chunk: list[str] = []
+    size = 0
+    for line in lines:
+        if chunk and size + len(line) + 1 > limit:
+            yield "\n".join(chunk)
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line) + 1
+    if chunk:
+        yield "\n".join(chunk)
+
+
+async def report_no_shows(
+    client: discord.Client, guild_state: GuildState, session: sqlite3.Row
+):
+    channel_id = guild_state.config.no_show_report_channel_id
+    if not channel_id:
+        return
+    channel = client.get_channel(channel_id)
+    if channel is None:
+        print("Could not find the no-show report channel.")
+        return
+
+    vote_message_id = session["vote_message_id"]
+    no_shows = find_no_shows(guild_state, session)
+    voters = len(guild_state.votes.attendees(vote_message_id))
+    header = (
+        f"**SSU no-shows** for vote {vote_message_id} "
+        f"(started <t:{int(session['started_at'])}:t>): {len(no_shows)} of "
+        f"{voters} voters never joined voice."
+    )
+    mentions = [f"<@{user_id}>" for user_id in no_shows]
+    for content in chunk_lines([header, *mentions]):
+        await outbound.send(
+            channel,
+            content=content,
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+
+class SSUVoteView(discord.ui.View):
+    """Persistent vote buttons; one registered instance serves every vote."""
+
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    # ✅ ATTEND / UNATTEND BUTTON
+    @discord.ui.button(
+        label="Attend Session",
+        style=discord.ButtonStyle.success,
+        custom_id="ssu_vote_attend",
+    )
+    async def attend_button(
+        self,
+        interaction: discord.Interaction,
+        button: discord.ui.Button
+    ):
+        guild_state = state_for(interaction.guild_id)
+
+        user_id = interaction.user.id
+
+        attending = guild_state.votes.toggle(interaction.message.id, user_id)
+        guild_state.votes.mark_changed(interaction.message)
+
+        if not attending:
+            await interaction.response.send_message(
+                "<:whitecheck:1191923481928028200> Sucessfully unmarked your attendance.",
+                ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                "<:whitecheck:1191923481928028200> Successfully marked your attendance..",
+                ephemeral=True
+            )
+
+    # ⬜ VIEW ATTENDEES BUTTON
+    @discord.ui.button(
+        label="View Attendees",
+        style=discord.ButtonStyle.secondary,
+        custom_id="ssu_vote_view_attendees",
+    )
+    async def view_attendees_button(
+        self,
+        interaction: discord.Interaction,
+        button: discord.ui.Button
+    ):
+        guild_state = state_for(interaction.guild_id)
+
+        try:
+            await check_member_roles(
+                interaction,
+                guild_state.config.ssu_vote_required_role_ids,
+                "You do not have permission to view attendees.",
+            )
+        except app_commands.CheckFailure as exc:
+            await interaction.response.send_message(str(exc), ephemeral=True)
+            return
+
+        attendees = guild_state.votes.attendees(interaction.message.id)
+        if not attendees:
+            await interaction.response.send_message(
+                "No one has marked attendance yet.",
+                ephemeral=True
+            )
+            return
+
+        mentions = []
+        for user_id in attendees:
+            mentions.append(f"<@{user_id}>")
+
+        attendee_list = "\n".join(mentions)
+
+        await interaction.response.send_message(
+            f"**Attendees ({len(attendees)}):**\n{attendee_list}",
+            ephemeral=True
+        )
+
+
+@bot.tree.command(
+    name="ssu_vote",
+    description="Start a session vote.",
+)
+@app_commands.describe(
+    session_time="Enter the time using a timestamp generator.",
+)
+@require_roles("ssu_vote_required_role_ids")
+@deferred
+async def ssu_vote(interaction: discord.Interaction, session_time: str):
+    guild_state = state_for(interaction.guild_id)
+
+    channel_id = guild_state.config.ssu_ssd_target_channel_id
+    channel = interaction.guild.get_channel(channel_id)
+    if channel is None:
+        await respond(
+            interaction,
+            "Could not find the SSU announcement channel.",
+            ephemeral=True,
+        )
+        return
+
+    embed = guild_state.templates.embed("ssu_vote", session_time=session_time)
+
+    message = await outbound.send(
+        channel, priority=PRIORITY_HIGH, embed=embed, view=SSUVoteView()
+    )
+    guild_state.votes.start(message.id, channel.id, session_time)
+
+    await respond(
+        interaction,
+        "Successfully ran the session vote command.",
+        ephemeral=True,
+    )
+
+
+@bot.tree.command(
+    name="ssu_no_shows",
+    description="List session voters who have not joined voice since the SSU.",
+)
+@app_commands.describe(
+    vote_message_id="Session vote message ID (defaults to the latest session)",
+)
+@require_roles("ssu_vote_required_role_ids")
+@deferred
+async def ssu_no_shows(
+    interaction: discord.Interaction, vote_message_id: str | None = None
+):
+    guild_state = state_for(interaction.guild_id)
+
+    message_id = None
+    if vote_message_id is not None:
+        message_id = parse_id(vote_message_id)
+        if message_id is None:
+            await respond(
+                interaction, "That is not a valid message ID.", ephemeral=True
+            )
+            return
+
+    session = guild_state.store.get_session(message_id)
+    if session is None:
+        await respond(
+            interaction,
+            "No SSU has been started for that session vote.",
+            ephemeral=True,
+        )
+        return
+
+    await respond_paginated(
+        interaction,
+        (f"<@{user_id}>" for user_id in find_no_shows(guild_state, session)),
+        header="**Voters missing from voice:**",
+        empty_message="Every voter has joined voice.",
+        separator=" ",
+    )
+
+# FETCH INFRACTIONS
+
+
+def find_reaction(message: discord.Message, emoji: str) -> discord.Reaction | None:
+    for reaction in message.reactions:
+        if str(reaction.emoji) == emoji:
+            return reaction
+    return None
+
+
+async def iter_reactors(reaction: discord.Reaction, guild: discord.Guild | None):
+    """Stream the non-bot users behind ``reaction`` page by page.
+
+    Each user is swapped for the cached guild member where there is one, so
+    the bot check and display name never need a fetch of their own.
+    """
+    async for user in reaction.users(limit=None):
+        member = guild.get_member(user.id) if guild is not None else None
+        user = member or user
+        if not user.bot:
+            yield user
+
+
+def csv_text(value: str) -> str:
+    """Quote user-controlled text so spreadsheets don't run it as a formula."""
+    if value.startswith(("=", "+", "-", "@", "\t", "\r")):
+        return "'" + value
+    return value
+
+
+def reactors_csv(users: list[discord.abc.User]) -> discord.File:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["user_id", "username", "display_name"])
+    for user in users:
+        writer.writerow([user.id, csv_text(user.name), csv_text(user.display_name)])
+    return discord.File(
+        io.BytesIO(buffer.getvalue().encode("utf-8")), filename="reactions.csv"
+    )
+
+
+@bot.tree.command(
+    name="fetch_reactions",
+    description="Fetch users who reacted to a message and mention them.",
+)
+@app_commands.describe(
+    message_id="The ID of the message to fetch reactions from",
+    emoji="The emoji reaction to check (✅ or <:name:id>)",
+    exclude_emoji="Leave out users who also reacted with this emoji",
+    export="Mention users in pages, or attach them as a CSV file",
+)
+@require_roles("fetch_reactions_required_role_id")
+@deferred
+async def fetch_reactions(
+    interaction: discord.Interaction,
+    message_id: str,
+    emoji: str,
+    exclude_emoji: str | None = None,
+    export: Literal["mentions", "csv"] = "mentions",
+):
+    try:
+        message = await interaction.channel.fetch_message(int(message_id))
+    except Exception:
+        await respond(
+            interaction,
+            "Could not find a message with that ID in this channel.",
+            ephemeral=True,
+        )
+        return
+
+    target_reaction = find_reaction(message, emoji)
+    if target_reaction is None:
+        await respond(
+            interaction,
+            "That reaction was not found on the message.",
+            ephemeral=True,
+        )
+        return
+
+    excluded: set[int] = set()
+    if exclude_emoji is not None:
+        excluded_reaction = find_reaction(message, exclude_emoji)
+        if excluded_reaction is not None:
+            excluded = {
+                user.id
+                async for user in excluded_reaction.users(limit=None)
+            }
+
+    users = (
+        user
+        async for user in iter_reactors(target_reaction, interaction.guild)
+        if user.id not in excluded
+    )
+
+    if export == "csv":
+        rows = [user async for user in users]
+        if not rows:
+            await respond(
+                interaction,
+                "No users have reacted with that emoji.",
+                ephemeral=True,
+            )
+            return
+        await respond(
+            interaction,
+            f"{len(rows)} user(s) reacted with {emoji}.",
+            file=reactors_csv(rows),
+            ephemeral=True,
+        )
+        return
+
+    await respond_paginated(
+        interaction,
+        (user.mention async for user in users),
+        header="**Users who reacted:**",
+        empty_message="No users have reacted with that emoji.",
+        separator=" ",
+    )
+
+
+# ================== RUN BOT ==================
+
+if __name__ == "__main__":
+    token = os.getenv("BOT_TOKEN")
+    if not token:
+        raise RuntimeError("BOT_TOKEN environment variable not set")
+    startup.end("import")
+    bot.run(token)
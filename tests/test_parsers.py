@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2500", 2500),
+        ("$2,500", 2500),
+        ("5 000", 5000),
+        ("1_000", 1000),
+        ("10k", 10_000),
+        ("1.5k", 1500),
+        ("2M", 2_000_000),
+        ("0", 0),
+    ],
+)
+def test_parse_fine_amount(text, expected):
+    assert main.parse_fine_amount(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "$",
+        "abc",
+        "-5",
+        "+5",
+        "1.5",
+        "1e3",
+        "1e9999999",
+        "1e9999999k",
+        "inf",
+        "nan",
+        "²",
+        str(main.SQLITE_MAX_INTEGER + 1),
+        "9" * 5000,
+        "1." + "0" * 40 + "1",
+    ],
+)
+def test_parse_fine_amount_rejects(text):
+    assert main.parse_fine_amount(text) is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1x evasion, 2x reckless driving", [(1, "Evasion"), (2, "Reckless Driving")]),
+        ("evasion x2", [(2, "Evasion")]),
+        ("evasion x 2", [(2, "Evasion")]),
+        ("evasion * 2", [(2, "Evasion")]),
+        ("evasion 2x", [(2, "Evasion")]),
+        ("evasion (2)", [(2, "Evasion")]),
+        ("2 counts of murder", [(2, "Murder")]),
+        ("2 * gta", [(2, "Grand Theft Auto")]),
+        ("evasion; fleeing police\nevasion", [(3, "Evasion")]),
+        ("100 mph over", [(1, "100 Mph Over")]),
+        ("tax2", [(1, "Tax2")]),
+        ("tax evasion x2", [(2, "Tax Evasion")]),
+        ("evasion\n1x\nrd", [(1, "Evasion"), (1, "Reckless Driving")]),
+        ("evasion, 2, (3), x4", [(1, "Evasion")]),
+        ("0x evasion", []),
+        ("", []),
+    ],
+)
+def test_parse_charges(text, expected):
+    assert main.parse_charges(text) == expected